@@ -2,107 +2,458 @@
 # .github/scripts/collect_pr_metrics.py
 
 import os
+import sys
+import json
+import argparse
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from github import Github
-from collections import defaultdict
-
-# Initialize GitHub client
-github_token = os.environ.get("GITHUB_TOKEN")
-repo_name = os.environ.get("REPO_NAME")
-g = Github(github_token)
-repo = g.get_repo(repo_name)
-
-# Get today's date for filename
-today = datetime.datetime.now().strftime("%Y-%m-%d")
-
-# Data structures to store metrics
-pr_data = []
-open_prs_count = 0
-total_cycle_time = datetime.timedelta(0)
-merged_prs_count = 0
-total_time_to_review = datetime.timedelta(0)
-prs_with_reviews_count = 0
-
-# Get pull requests (limited to last 1000 for API efficiency)
-pull_requests = repo.get_pulls(state='all', sort='created', direction='desc')[:1000]
-
-for pr in pull_requests:
-    # Basic PR info
-    pr_info = {
-        'number': pr.number,
-        'title': pr.title,
-        'created_at': pr.created_at,
-        'updated_at': pr.updated_at,
-        'state': pr.state,
-        'user': pr.user.login,
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from github_client import get_client
+from github_app import app_auth_from_env
+import pr_metrics_store
+
+# --- Config ---
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
+REPO_NAME = os.environ.get("REPO_NAME")
+# Comma-separated organizations whose repositories are all collected instead of REPO_NAME
+ORGS = os.environ.get("PR_METRICS_ORGS", "")
+# Repositories collected at once; they share each credential's rate limiter
+WORKERS = int(os.environ.get("PR_METRICS_WORKERS", "8"))
+# Most recently created PRs to look at
+MAX_PRS = int(os.environ.get("PR_METRICS_MAX_PRS", "1000"))
+# GraphQL connections return at most 100 nodes per page
+PAGE_SIZE = 100
+# Cursor and compact per-PR state carried between incremental runs
+STATE_FILE = os.environ.get("PR_METRICS_STATE", "pr-metrics-state.json")
+
+# One page of PRs together with the fields the metrics need. reviews are
+# returned oldest first, so first:1 is the first submitted review; pending
+# (unsubmitted) reviews have no submittedAt and are left out.
+PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String, $orderBy: IssueOrder!) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $first, after: $after, orderBy: $orderBy) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        createdAt
+        updatedAt
+        state
+        mergedAt
+        author { login }
+        reviews(first: 1, states: [APPROVED, CHANGES_REQUESTED, COMMENTED, DISMISSED]) {
+          nodes { submittedAt author { login } }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+REPOSITORIES_QUERY = """
+query($org: String!, $after: String) {
+  organization(login: $org) {
+    repositories(first: 100, after: $after, isArchived: false, orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { nameWithOwner }
+    }
+  }
+}
+"""
+
+
+def parse_timestamp(value):
+    """GitHub ISO 8601 timestamp as an aware datetime, or None"""
+    if not value:
+        return None
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def login_of(actor):
+    # Deleted accounts come back as a null author
+    return actor["login"] if actor else "ghost"
+
+
+# --- Collection ---
+def list_repositories(client, org):
+    """Names ("owner/repo") of the organization's unarchived repositories"""
+    cursor = None
+    while True:
+        result = client.graphql(REPOSITORIES_QUERY, {"org": org, "after": cursor})
+        if result.get("errors"):
+            raise RuntimeError(f"GraphQL error for {org}: {result['errors'][0].get('message')}")
+        connection = ((result.get("data") or {}).get("organization") or {}).get("repositories")
+        if connection is None:
+            raise RuntimeError(f"Organization {org} not found or not accessible")
+        for node in connection["nodes"]:
+            yield node["nameWithOwner"]
+        if not connection["pageInfo"]["hasNextPage"]:
+            return
+        cursor = connection["pageInfo"]["endCursor"]
+
+
+def fetch_pull_requests(client, repo_name, limit=MAX_PRS, since=None):
+    """Yield PR nodes, PAGE_SIZE per GraphQL request
+
+    Without since, the newest limit PRs by creation date. With since (an
+    updatedAt timestamp), every PR updated at or after it, most recently
+    updated first, stopping at the first page that reaches older ones.
+    """
+    owner, name = repo_name.split("/", 1)
+    field = "UPDATED_AT" if since else "CREATED_AT"
+    cursor = None
+    fetched = 0
+    while since or fetched < limit:
+        variables = {
+            "owner": owner,
+            "name": name,
+            "first": PAGE_SIZE if since else min(PAGE_SIZE, limit - fetched),
+            "after": cursor,
+            "orderBy": {"field": field, "direction": "DESC"},
+        }
+        result = client.graphql(PULL_REQUESTS_QUERY, variables)
+        if result.get("errors"):
+            raise RuntimeError(f"GraphQL error for {repo_name}: {result['errors'][0].get('message')}")
+        connection = ((result.get("data") or {}).get("repository") or {}).get("pullRequests")
+        if connection is None:
+            raise RuntimeError(f"Repository {repo_name} not found or not accessible")
+        for node in connection["nodes"]:
+            if since and parse_timestamp(node["updatedAt"]) < since:
+                return
+            yield node
+        fetched += len(connection["nodes"])
+        if not connection["pageInfo"]["hasNextPage"]:
+            break
+        cursor = connection["pageInfo"]["endCursor"]
+
+
+def compact(node):
+    """The fields of a PR node the metrics are computed from, as stored in the state file"""
+    reviews = node["reviews"]["nodes"]
+    first_review = reviews[0] if reviews and reviews[0]["submittedAt"] else None
+    return {
+        "number": node["number"],
+        "title": node["title"],
+        "createdAt": node["createdAt"],
+        "updatedAt": node["updatedAt"],
+        "state": node["state"],
+        "mergedAt": node["mergedAt"],
+        "author": login_of(node["author"]),
+        "firstReviewAt": first_review["submittedAt"] if first_review else None,
+        "firstReviewer": login_of(first_review["author"]) if first_review else None,
+    }
+
+
+# --- Incremental state ---
+def load_state(path):
+    """Saved cursor and PRs per repository ("owner/repo" -> state)"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if "repo" in state:
+        # Single-repository layout written before the org-wide mode
+        return {state["repo"]: state}
+    return state.get("repos", {})
+
+
+def save_state(path, states):
+    # Written aside and renamed so an interrupted run leaves the old state intact
+    partial = f"{path}.partial"
+    with open(partial, "w", encoding="utf-8") as f:
+        json.dump({"repos": states}, f, separators=(",", ":"))
+    os.replace(partial, path)
+
+
+def collect(client, repo_name, state=None, limit=MAX_PRS):
+    """Fetch what changed since state (everything if None) and return the new state"""
+    if state and not state.get("cursor"):
+        state = None
+    since = parse_timestamp(state["cursor"]) if state else None
+    prs = dict(state["prs"]) if state else {}
+    updated = 0
+    for node in fetch_pull_requests(client, repo_name, limit=limit, since=since):
+        prs[str(node["number"])] = compact(node)
+        updated += 1
+
+    # ISO 8601 UTC timestamps order the same as strings
+    cursor = max((entry["updatedAt"] for entry in prs.values()), default=state["cursor"] if state else None)
+    # Keep the same window a full run would see: the newest limit PRs by creation
+    window = sorted(prs.values(), key=lambda entry: entry["createdAt"], reverse=True)[:limit]
+    print(f"{repo_name}: fetched {updated} PRs {'updated since ' + state['cursor'] if state else 'from scratch'}")
+    return {
+        "cursor": cursor,
+        "prs": {str(entry["number"]): entry for entry in window},
+    }
+
+
+def collect_all(targets, states, workers=WORKERS):
+    """Collect every (client, repo) target on a bounded thread pool
+
+    Returns the updated states and the repositories that failed; a failed
+    repository keeps its previous state.
+    """
+    states = dict(states)
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            repo_name: pool.submit(collect, client, repo_name, states.get(repo_name))
+            for client, repo_name in targets
+        }
+        for repo_name, future in futures.items():
+            try:
+                states[repo_name] = future.result()
+            except Exception as e:
+                print(f"[!] {repo_name}: {e}", file=sys.stderr)
+                failed.append(repo_name)
+    return states, failed
+
+
+# --- Aggregation ---
+# Detailed columns, in output order
+DETAILED_COLUMNS = [
+    'repo', 'number', 'title', 'created_at', 'updated_at', 'state', 'user', 'merged_at',
+    'cycle_time_hours', 'first_review_at', 'time_to_review_hours', 'first_reviewer',
+]
+COUNT_COLUMNS = ['open_prs_count', 'merged_prs_count', 'prs_with_reviews_count']
+MEAN_COLUMNS = ['avg_cycle_time_hours', 'avg_time_to_review_hours']
+PERCENTILES = (0.5, 0.9, 0.99)
+# Trailing window for the rolling weekly percentiles
+ROLLING_WINDOW = "28D"
+
+
+def pr_frame(states, repo_names):
+    """All PRs of repo_names as one DataFrame, durations computed column-wise"""
+    entries = [
+        dict(entry, repo=repo_name)
+        for repo_name in repo_names if repo_name in states
+        for entry in states[repo_name]["prs"].values()
+    ]
+    raw = pd.DataFrame(entries, columns=["repo", "number", "title", "createdAt", "updatedAt", "state",
+                                         "mergedAt", "author", "firstReviewAt", "firstReviewer"])
+    df = pd.DataFrame({
+        'repo': raw["repo"],
+        'number': raw["number"],
+        'title': raw["title"],
+        'created_at': pd.to_datetime(raw["createdAt"], utc=True),
+        'updated_at': pd.to_datetime(raw["updatedAt"], utc=True),
+        # Same open/closed states as the REST API; merged PRs are closed
+        'state': raw["state"].where(raw["state"] == "OPEN", "CLOSED").str.lower(),
+        'user': raw["author"],
+        'merged_at': pd.to_datetime(raw["mergedAt"], utc=True),
+        'first_review_at': pd.to_datetime(raw["firstReviewAt"], utc=True),
+        'first_reviewer': raw["firstReviewer"],
+    })
+    hour = pd.Timedelta(hours=1)
+    df['cycle_time_hours'] = (df['merged_at'] - df['created_at']) / hour
+    df['time_to_review_hours'] = (df['first_review_at'] - df['created_at']) / hour
+    df = df[DETAILED_COLUMNS]
+    return df.sort_values(['repo', 'created_at'], ascending=[True, False], ignore_index=True)
+
+
+def percentiles(grouped, column, prefix, levels=PERCENTILES):
+    """p50/p90/... of column per group, one column per level"""
+    table = grouped[column].quantile(list(levels)).unstack()
+    table = table.reindex(columns=list(levels))
+    table.columns = [f"{prefix}_p{round(level * 100)}_hours" for level in levels]
+    return table
+
+
+def summarize(pr_df, repo_names=None):
+    """Per repository: counts, means and percentiles of cycle and review time
+
+    With repo_names, every one of them gets a row, with zero counts when it
+    has no PRs.
+    """
+    grouped = pr_df.assign(open=pr_df['state'].eq('open')).groupby('repo')
+    summary = grouped.agg(
+        open_prs_count=('open', 'sum'),
+        merged_prs_count=('cycle_time_hours', 'count'),
+        avg_cycle_time_hours=('cycle_time_hours', 'mean'),
+        avg_time_to_review_hours=('time_to_review_hours', 'mean'),
+        prs_with_reviews_count=('time_to_review_hours', 'count'),
+    )
+    # Means were reported as 0 when there was nothing to average
+    summary[MEAN_COLUMNS] = summary[MEAN_COLUMNS].fillna(0)
+    summary = summary.join([
+        percentiles(grouped, 'cycle_time_hours', 'cycle_time'),
+        percentiles(grouped, 'time_to_review_hours', 'time_to_review'),
+    ])
+    if repo_names is not None:
+        summary = summary.reindex(pd.Index(repo_names, name='repo'))
+        summary[COUNT_COLUMNS] = summary[COUNT_COLUMNS].fillna(0).astype('int64')
+        summary[MEAN_COLUMNS] = summary[MEAN_COLUMNS].fillna(0)
+    return summary
+
+
+def by_author(pr_df):
+    """Per repository and PR author: volume, cycle time and how long their PRs waited for review"""
+    grouped = pr_df.groupby(['repo', 'user'])
+    authors = grouped.agg(
+        prs_count=('number', 'size'),
+        merged_prs_count=('cycle_time_hours', 'count'),
+        avg_cycle_time_hours=('cycle_time_hours', 'mean'),
+    )
+    return authors.join([
+        percentiles(grouped, 'cycle_time_hours', 'cycle_time', (0.5, 0.9)),
+        percentiles(grouped, 'time_to_review_hours', 'time_to_review', (0.5, 0.9)),
+    ])
+
+
+def by_reviewer(pr_df):
+    """Per repository and first reviewer: how many PRs they reviewed first, and how soon"""
+    reviewed = pr_df.dropna(subset=['first_reviewer']).rename(columns={'first_reviewer': 'reviewer'})
+    grouped = reviewed.groupby(['repo', 'reviewer'])
+    reviewers = grouped.agg(
+        first_reviews_count=('number', 'size'),
+        avg_time_to_review_hours=('time_to_review_hours', 'mean'),
+    )
+    return reviewers.join(percentiles(grouped, 'time_to_review_hours', 'time_to_review', (0.5, 0.9)))
+
+
+def week_start(timestamps):
+    return timestamps.dt.tz_localize(None).dt.to_period('W-SUN').dt.start_time
+
+
+def weekly(pr_df):
+    """Per repository and week (starting Monday): PRs opened and merged, cycle time
+    of that week's merges, and rolling ROLLING_WINDOW percentiles as of the week's end"""
+    opened = pr_df.groupby(['repo', week_start(pr_df['created_at']).rename('week')]).size().rename('prs_opened')
+
+    merged = pr_df.dropna(subset=['merged_at']).sort_values(['repo', 'merged_at'])
+    merged = merged.assign(week=week_start(merged['merged_at']))
+    grouped = merged.groupby(['repo', 'week'])
+    merges = grouped.agg(prs_merged=('number', 'size')).join(
+        percentiles(grouped, 'cycle_time_hours', 'cycle_time', (0.5, 0.9)))
+
+    # Time-based windows over each repository's merges, sampled at the last merge of every week
+    rolling = merged.groupby('repo').rolling(ROLLING_WINDOW, on='merged_at')['cycle_time_hours']
+    trailing = pd.DataFrame({
+        'rolling_cycle_time_p50_hours': rolling.quantile(0.5).to_numpy(),
+        'rolling_cycle_time_p90_hours': rolling.quantile(0.9).to_numpy(),
+    }, index=pd.MultiIndex.from_arrays([merged['repo'], merged['week']]))
+    trailing = trailing[~trailing.index.duplicated(keep='last')]
+
+    table = pd.concat([opened, merges, trailing], axis=1).sort_index()
+    table[['prs_opened', 'prs_merged']] = table[['prs_opened', 'prs_merged']].fillna(0).astype('int64')
+    table.index = table.index.set_levels(table.index.levels[1].strftime('%Y-%m-%d'), level=1)
+    return table
+
+
+def aggregate(pr_df, today, repo_names=None, failed=()):
+    """Every derived table for today's run, each a flat DataFrame with a date column
+
+    pr_df holds the repositories collected today (repo_names). The summary
+    has a row for each of them, and one with collected=False and no figures
+    for each failed repository, whose PRs are left out of every table.
+    """
+    summary = summarize(pr_df, repo_names).assign(collected=True)
+    if failed:
+        missing = pd.DataFrame({'collected': False}, index=pd.Index(list(failed), name='repo'))
+        summary = pd.concat([summary.astype({column: 'Int64' for column in COUNT_COLUMNS}), missing])
+    tables = {
+        "summary": summary,
+        "authors": by_author(pr_df),
+        "reviewers": by_reviewer(pr_df),
+        "weekly": weekly(pr_df),
     }
-    
-    # Count open PRs
-    if pr.state == 'open':
-        open_prs_count += 1
-    
-    # Calculate cycle time for merged PRs
-    if pr.merged:
-        pr_info['merged_at'] = pr.merged_at
-        cycle_time = pr.merged_at - pr.created_at
-        pr_info['cycle_time_hours'] = cycle_time.total_seconds() / 3600
-        total_cycle_time += cycle_time
-        merged_prs_count += 1
+    flat = {}
+    for name, table in tables.items():
+        flat[name] = table.reset_index()
+        flat[name].insert(0, 'date', today)
+    return flat
+
+
+# --- Output ---
+def write_outputs(pr_df, tables, today):
+    if pr_metrics_store.available:
+        # Today's partitions only; history is never reread or rewritten
+        pr_metrics_store.write_partition(pr_df, "detailed", today)
+        for name, table in tables.items():
+            pr_metrics_store.write_partition(table, name, today)
+        tables["summary"].to_csv(f'pr-metrics-summary-{today}.csv', index=False)
+        return
+
+    print("[!] pyarrow is not installed; writing CSV files instead of the Parquet dataset", file=sys.stderr)
+    # Create detailed PR dataframe and save to CSV
+    pr_df.to_csv(f'pr-metrics-detailed-{today}.csv', index=False)
+    summary_df = tables["summary"]
+
+    # Append to historical summary if it exists
+    summary_file = 'pr-metrics-summary.csv'
+    if os.path.exists(summary_file):
+        historical_df = pd.read_csv(summary_file)
+        updated_df = pd.concat([historical_df, summary_df])
+        updated_df.to_csv(summary_file, index=False)
+    else:
+        summary_df.to_csv(summary_file, index=False)
+
+    # Create daily files as well
+    for name, table in tables.items():
+        table.to_csv(f'pr-metrics-{name}-{today}.csv', index=False)
+
+
+def client_for(owner):
+    # A GitHub App configured through GITHUB_APP_* is used instead of GITHUB_TOKEN
+    # when present. Each org has its own installation, and so its own client and
+    # rate limit; with a token every repository shares one client.
+    return get_client(app_auth_from_env(installation_owner=owner) or GITHUB_TOKEN)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect pull request cycle-time metrics")
+    parser.add_argument("--org", action="append",
+                        help="Collect every repository of this organization instead of REPO_NAME "
+                             "(repeatable; default: $PR_METRICS_ORGS)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Repositories collected at once (default: %(default)s)")
+    parser.add_argument("--state", default=STATE_FILE, help="State file for incremental runs (default: %(default)s)")
+    parser.add_argument("--full", action="store_true", help="Ignore the saved state and refetch the whole window")
+    args = parser.parse_args()
+    # argparse would append --org values to a list default, so the env var is only a fallback
+    if args.org is None:
+        args.org = [org for org in ORGS.split(",") if org]
+
+    today = datetime.datetime.now().strftime("%Y-%m-%d")
+    if args.org:
+        targets = []
+        for org in args.org:
+            client = client_for(org)
+            targets.extend((client, repo_name) for repo_name in list_repositories(client, org))
+        print(f"Collecting {len(targets)} repositories from {', '.join(args.org)}")
     else:
-        pr_info['merged_at'] = None
-        pr_info['cycle_time_hours'] = None
-    
-    # Calculate time to first review
-    reviews = list(pr.get_reviews())
-    if reviews:
-        first_review = min(reviews, key=lambda r: r.submitted_at)
-        time_to_review = first_review.submitted_at - pr.created_at
-        pr_info['first_review_at'] = first_review.submitted_at
-        pr_info['time_to_review_hours'] = time_to_review.total_seconds() / 3600
-        pr_info['first_reviewer'] = first_review.user.login
-        
-        total_time_to_review += time_to_review
-        prs_with_reviews_count += 1
+        targets = [(client_for(REPO_NAME), REPO_NAME)]
+
+    states = {} if args.full else load_state(args.state)
+    states, failed = collect_all(targets, states, workers=args.workers)
+    save_state(args.state, states)
+
+    # A failed repository's saved state is stale, so it is not reported as today's
+    collected = [repo_name for _, repo_name in targets if repo_name not in failed]
+    pr_df = pr_frame(states, collected)
+    tables = aggregate(pr_df, today, collected, failed)
+    write_outputs(pr_df, tables, today)
+
+    overall = summarize(pr_df.assign(repo='all'))
+    summary = overall.iloc[0] if len(overall) else pd.Series(0.0, index=overall.columns)
+    print(f"Repositories: {len(collected)}" + (f" ({len(failed)} failed)" if failed else ""))
+    print(f"Open PRs: {int(summary['open_prs_count'])}")
+    print(f"PR Cycle Time: {summary['avg_cycle_time_hours']:.2f} hours average, "
+          f"p50 {summary['cycle_time_p50_hours']:.2f}, p90 {summary['cycle_time_p90_hours']:.2f}, "
+          f"p99 {summary['cycle_time_p99_hours']:.2f}")
+    print(f"Time to First Review: {summary['avg_time_to_review_hours']:.2f} hours average, "
+          f"p50 {summary['time_to_review_p50_hours']:.2f}, p90 {summary['time_to_review_p90_hours']:.2f}, "
+          f"p99 {summary['time_to_review_p99_hours']:.2f}")
+    if pr_metrics_store.available:
+        print(f"Metrics saved to {pr_metrics_store.DATASET_ROOT}/")
     else:
-        pr_info['first_review_at'] = None
-        pr_info['time_to_review_hours'] = None
-        pr_info['first_reviewer'] = None
-    
-    pr_data.append(pr_info)
-
-# Calculate averages
-avg_cycle_time_hours = (total_cycle_time.total_seconds() / 3600) / merged_prs_count if merged_prs_count > 0 else 0
-avg_time_to_review_hours = (total_time_to_review.total_seconds() / 3600) / prs_with_reviews_count if prs_with_reviews_count > 0 else 0
-
-# Create detailed PR dataframe and save to CSV
-pr_df = pd.DataFrame(pr_data)
-pr_df.to_csv(f'pr-metrics-detailed-{today}.csv', index=False)
-
-# Create summary metrics dataframe
-summary_data = {
-    'date': [today],
-    'open_prs_count': [open_prs_count],
-    'merged_prs_count': [merged_prs_count],
-    'avg_cycle_time_hours': [avg_cycle_time_hours],
-    'avg_time_to_review_hours': [avg_time_to_review_hours],
-    'prs_with_reviews_count': [prs_with_reviews_count]
-}
-summary_df = pd.DataFrame(summary_data)
-
-# Append to historical summary if it exists
-summary_file = 'pr-metrics-summary.csv'
-if os.path.exists(summary_file):
-    historical_df = pd.read_csv(summary_file)
-    updated_df = pd.concat([historical_df, summary_df])
-    updated_df.to_csv(summary_file, index=False)
-else:
-    summary_df.to_csv(summary_file, index=False)
-
-# Create a daily summary file as well
-summary_df.to_csv(f'pr-metrics-summary-{today}.csv', index=False)
-
-print(f"Open PRs: {open_prs_count}")
-print(f"Average PR Cycle Time: {avg_cycle_time_hours:.2f} hours")
-print(f"Average Time to First Review: {avg_time_to_review_hours:.2f} hours")
-print(f"Metrics saved to CSV files")
+        print(f"Metrics saved to CSV files")
+    if failed and len(failed) == len(targets):
+        sys.exit("Collecting PR metrics failed for every repository")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Date-partitioned Parquet history for PR metrics.
+
+Each run writes one file per table under <root>/<table>/date=YYYY-MM-DD/,
+so earlier days are never read or rewritten. read_range() only opens the
+partitions inside the requested dates. pyarrow is optional: without it
+available is False and the collector falls back to CSV files.
+
+    python pr_metrics_store.py summary 2026-01-01 2026-03-31 > q1.csv
+"""
+import os
+import sys
+import argparse
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+available = pa is not None
+
+# --- Config ---
+DATASET_ROOT = os.environ.get("PR_METRICS_DATASET", "pr-metrics")
+PARTITION_FILE = "part-0.parquet"
+
+if available:
+    # Fixed schemas, so a day where a column happens to be all empty still
+    # reads back together with the others
+    TIMESTAMP = pa.timestamp("us", tz="UTC")
+    SCHEMAS = {
+        "detailed": pa.schema([
+            ("repo", pa.string()),
+            ("number", pa.int64()),
+            ("title", pa.string()),
+            ("created_at", TIMESTAMP),
+            ("updated_at", TIMESTAMP),
+            ("state", pa.string()),
+            ("user", pa.string()),
+            ("merged_at", TIMESTAMP),
+            ("cycle_time_hours", pa.float64()),
+            ("first_review_at", TIMESTAMP),
+            ("time_to_review_hours", pa.float64()),
+            ("first_reviewer", pa.string()),
+        ]),
+        "summary": pa.schema([
+            ("repo", pa.string()),
+            ("open_prs_count", pa.int64()),
+            ("merged_prs_count", pa.int64()),
+            ("avg_cycle_time_hours", pa.float64()),
+            ("avg_time_to_review_hours", pa.float64()),
+            ("prs_with_reviews_count", pa.int64()),
+            ("cycle_time_p50_hours", pa.float64()),
+            ("cycle_time_p90_hours", pa.float64()),
+            ("cycle_time_p99_hours", pa.float64()),
+            ("time_to_review_p50_hours", pa.float64()),
+            ("time_to_review_p90_hours", pa.float64()),
+            ("time_to_review_p99_hours", pa.float64()),
+            # False for a repository that could not be fetched that day
+            ("collected", pa.bool_()),
+        ]),
+        "authors": pa.schema([
+            ("repo", pa.string()),
+            ("user", pa.string()),
+            ("prs_count", pa.int64()),
+            ("merged_prs_count", pa.int64()),
+            ("avg_cycle_time_hours", pa.float64()),
+            ("cycle_time_p50_hours", pa.float64()),
+            ("cycle_time_p90_hours", pa.float64()),
+            ("time_to_review_p50_hours", pa.float64()),
+            ("time_to_review_p90_hours", pa.float64()),
+        ]),
+        "reviewers": pa.schema([
+            ("repo", pa.string()),
+            ("reviewer", pa.string()),
+            ("first_reviews_count", pa.int64()),
+            ("avg_time_to_review_hours", pa.float64()),
+            ("time_to_review_p50_hours", pa.float64()),
+            ("time_to_review_p90_hours", pa.float64()),
+        ]),
+        "weekly": pa.schema([
+            ("repo", pa.string()),
+            ("week", pa.string()),
+            ("prs_opened", pa.int64()),
+            ("prs_merged", pa.int64()),
+            ("cycle_time_p50_hours", pa.float64()),
+            ("cycle_time_p90_hours", pa.float64()),
+            ("rolling_cycle_time_p50_hours", pa.float64()),
+            ("rolling_cycle_time_p90_hours", pa.float64()),
+        ]),
+    }
+    PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+
+
+def partition_path(root, table, date):
+    return os.path.join(root, table, f"date={date}", PARTITION_FILE)
+
+
+def write_partition(df, table, date, root=DATASET_ROOT):
+    """Write df as the given day's partition of table
+
+    Only that day's file is touched; running again on the same day replaces
+    it rather than adding duplicate rows.
+    """
+    schema = SCHEMAS[table]
+    frame = df.reindex(columns=schema.names)
+    arrow_table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+    path = partition_path(root, table, date)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Written aside and renamed so readers never see a half-written file;
+    # dot files are skipped by dataset discovery
+    partial = os.path.join(os.path.dirname(path), f".{PARTITION_FILE}.partial")
+    pq.write_table(arrow_table, partial)
+    os.replace(partial, path)
+    return path
+
+
+def read_range(table, start=None, end=None, root=DATASET_ROOT, columns=None):
+    """Rows of table for dates start..end (inclusive, YYYY-MM-DD) as a DataFrame
+
+    The date bounds are matched against partition directory names, so files
+    outside the range are never opened.
+    """
+    directory = os.path.join(root, table)
+    schema = SCHEMAS[table].append(pa.field("date", pa.string()))
+    if not os.path.isdir(directory):
+        return schema.empty_table().to_pandas()
+    dataset = ds.dataset(directory, format="parquet", partitioning=PARTITIONING, schema=schema)
+    condition = None
+    if start:
+        condition = ds.field("date") >= start
+    if end:
+        upper = ds.field("date") <= end
+        condition = upper if condition is None else condition & upper
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a date range of PR metrics as CSV")
+    parser.add_argument("table", choices=["detailed", "summary", "authors", "reviewers", "weekly"])
+    parser.add_argument("start", nargs="?", help="First date, YYYY-MM-DD (default: earliest)")
+    parser.add_argument("end", nargs="?", help="Last date, YYYY-MM-DD (default: latest)")
+    parser.add_argument("--root", default=DATASET_ROOT, help="Dataset directory (default: %(default)s)")
+    args = parser.parse_args()
+
+    if not available:
+        sys.exit("Reading the PR metrics dataset needs pyarrow: pip install pyarrow")
+    df = read_range(args.table, args.start, args.end, root=args.root)
+    df.sort_values("date", kind="stable").to_csv(sys.stdout, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,22 @@
 import os
+import sys
 import json
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from github_client import get_client
+from github_app import app_auth_from_env
+
 # GitHub API setup
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 REPO_NAME = os.getenv("REPO_NAME")  # e.g., "owner/repo"
-HEADERS = {"Authorization": f"token {GITHUB_TOKEN}", "Accept": "application/vnd.github+json"}
+HEADERS = {"Accept": "application/vnd.github+json"}
 API_BASE = "https://api.github.com"
+# The client adds the Authorization header; a GitHub App configured through
+# GITHUB_APP_* is used instead of GITHUB_TOKEN when present
+client = get_client(app_auth_from_env(installation_owner=REPO_NAME) or GITHUB_TOKEN, api_base=API_BASE)
 
 # Datadog API setup
 DATADOG_API_KEY = os.getenv("DATADOG_API_KEY")
@@ -16,9 +24,9 @@ DATADOG_API_URL = "https://api.us5.datadoghq.com/api/v1/series"
 
 # Helper function to query GitHub API
 def github_api_request(endpoint):
-    url = f"{API_BASE}/{endpoint}"
-    response = requests.get(url, headers=HEADERS)
-    if response.status_code == 403:  # Handle API rate limits or permission issues
+    # The shared client paces calls and retries rate-limit rejections itself
+    response = client.get(endpoint, headers=HEADERS)
+    if response.status_code == 403:  # Handle permission issues
         print(f"API error for {endpoint}: {response.text}")
         return []
     response.raise_for_status()
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""asyncio provisioning core.
+
+Same steps and result format as workshop_orchestrator.py, but every GitHub
+call goes through one pooled httpx.AsyncClient and git runs through
+asyncio.create_subprocess_exec, so hundreds of participants can be in
+flight from a single thread. A semaphore bounds participants in flight and
+a second one bounds concurrent git pushes. Needs httpx:
+
+    pip install httpx
+    python async_provisioning.py --roster roster.csv --repos Java-Repo01 --token ... --enterprise-id ...
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import atexit
+import argparse
+import itertools
+import tempfile
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+import github_client
+from github_client import (GRAPHQL_ACCEPT, REST_ACCEPT, CONNECT_TIMEOUT, READ_TIMEOUT,
+                           endpoint_for, is_write, span_attributes, set_api_base)
+from rate_limiter import RateLimiter, resource_for, MAX_RETRIES
+from user_lookup import build_search_query, parse_search_result, SEARCH_BATCH_SIZE
+from mirror_cache import authenticated_url, git_subcommand, git_remote, repository_size, set_git_base
+from push_scheduler import describe_push, MAX_PUSHES
+from workshop_orchestrator import is_valid_email, generate_unique_org_name, build_org_mutation
+from roster import read_roster
+import tracing
+import metrics
+
+# --- Config ---
+CONCURRENCY = int(os.environ.get("WORKSHOP_ASYNC_CONCURRENCY", "200"))
+MAX_CONNECTIONS = int(os.environ.get("GITHUB_ASYNC_MAX_CONNECTIONS", "100"))
+
+
+class AsyncGitHubClient:
+    """asyncio counterpart of GitHubClient over one pooled httpx.AsyncClient"""
+
+    def __init__(self, token, api_base=None, max_connections=MAX_CONNECTIONS,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+        if httpx is None:
+            raise RuntimeError("The async provisioning core needs httpx: pip install httpx")
+        self.token = token
+        self.auth = None if isinstance(token, str) else token
+        self.api_base = (api_base or github_client.API_BASE).rstrip("/")
+        self.limiter = RateLimiter()
+
+        headers = {"Accept": REST_ACCEPT}
+        if self.auth is None:
+            headers["Authorization"] = f"Bearer {token}"
+        self.http = httpx.AsyncClient(
+            headers=headers,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+
+    def url(self, path):
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.api_base}/{path.lstrip('/')}"
+
+    async def request(self, method, path, write=None, **kwargs):
+        """Send a request, paced by the rate limiter and retried when rate-limited"""
+        resource = resource_for(path)
+        if write is None:
+            write = is_write(method, resource, kwargs)
+
+        endpoint = None
+        with tracing.span("github.request") as span:
+            if span.recording or metrics.available:
+                endpoint = endpoint_for(path, kwargs)
+            for attempt in range(MAX_RETRIES + 1):
+                if self.auth is not None:
+                    # Only a fetch of a new installation token leaves the event loop
+                    token = self.auth.cached_token() or await asyncio.to_thread(self.auth.token)
+                    kwargs["headers"] = dict(kwargs.get("headers") or {}, Authorization=f"Bearer {token}")
+                wait = self.limiter.reserve(resource, write)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                started = time.monotonic()
+                response = await self.http.request(method, self.url(path), **kwargs)
+                elapsed = time.monotonic() - started
+                self.limiter.update(resource, response)
+                if response.status_code == 401 and self.auth is not None and attempt == 0:
+                    self.auth.invalidate()
+                    continue
+                if metrics.available:
+                    metrics.record_api_call(method, endpoint, response.status_code, elapsed, self.limiter.budget())
+                if attempt == MAX_RETRIES or not self.limiter.is_rate_limited(response):
+                    break
+                await asyncio.sleep(self.limiter.backoff_delay(response, attempt))
+            if span.recording:
+                span.set(**span_attributes(method, endpoint, response, attempt + 1))
+            return response
+
+    async def post(self, path, **kwargs):
+        return await self.request("POST", path, **kwargs)
+
+    async def graphql(self, query, variables=None):
+        payload = {"query": query}
+        if variables:
+            payload["variables"] = variables
+        response = await self.post("graphql", headers={"Accept": GRAPHQL_ACCEPT}, json=payload)
+        return response.json()
+
+    async def aclose(self):
+        await self.http.aclose()
+
+
+# --- git ---
+async def run_git_async(args, github_token=None, cwd=None):
+    """Run a git command without blocking the event loop; raise RuntimeError on failure"""
+    subcommand = git_subcommand(args)
+    with tracing.span(f"git {subcommand}") as span:
+        proc = await asyncio.create_subprocess_exec(
+            "git", *args, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+        if span.recording:
+            span.set(**{"git.returncode": proc.returncode, "git.remote": git_remote(args) or ""})
+    if proc.returncode != 0:
+        stderr = stderr.decode(errors="replace").strip()
+        if github_token:
+            stderr = stderr.replace(github_token, "***")
+        raise RuntimeError(f"git {subcommand} failed ({proc.returncode}): {stderr}")
+    return stdout
+
+async def push_mirror_async(repo_dir, org_login, repo, github_token):
+    """Async push_mirror: same result dict, so describe_push() applies"""
+    github_token = github_client.token_value(github_token)
+    push_url = authenticated_url(org_login, repo, github_token)
+    start = time.monotonic()
+    with tracing.span("git push", **{"git.remote": f"{org_login}/{repo}"}) as span:
+        proc = await asyncio.create_subprocess_exec(
+            "git", "-C", repo_dir, "push", "--mirror", push_url,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await proc.communicate()
+        size_bytes = None
+        if span.recording or metrics.available:
+            # Walking a large repo would hold up every other participant
+            size_bytes = await asyncio.to_thread(repository_size, repo_dir)
+        if span.recording:
+            span.set(**{"git.returncode": proc.returncode, "git.bytes": size_bytes})
+    metrics.record_push(proc.returncode == 0, time.monotonic() - start, size_bytes)
+    stderr = stderr.decode(errors="replace").strip()
+    if github_token:
+        stderr = stderr.replace(github_token, "***")
+    return {
+        "org_login": org_login,
+        "repo": repo,
+        "returncode": proc.returncode,
+        "stderr": stderr,
+        "duration": time.monotonic() - start
+    }
+
+
+class TemplateRepos:
+    """Bare clones of the template repos, each fetched once per run on first use"""
+
+    def __init__(self, source_org, github_token, work_dir):
+        self.source_org = source_org
+        self.github_token = github_token
+        self.work_dir = work_dir
+        self._clones = {}
+
+    async def _clone(self, repo):
+        path = os.path.join(self.work_dir, f"{repo}.git")
+        token = github_client.token_value(self.github_token)
+        await run_git_async(["clone", "--bare", authenticated_url(self.source_org, repo, token), path], token)
+        return path
+
+    async def path(self, repo):
+        # The event loop is single-threaded, so check-then-create is safe
+        if repo not in self._clones:
+            self._clones[repo] = asyncio.ensure_future(self._clone(repo))
+        return await asyncio.shield(self._clones[repo])
+
+
+# --- Provisioning steps ---
+async def resolve_logins_async(emails, client, batch_size=SEARCH_BATCH_SIZE):
+    """Batched login search with all batches in flight at once"""
+    emails = list(dict.fromkeys(emails))
+    chunks = [emails[start:start + batch_size] for start in range(0, len(emails), batch_size)]
+    responses = await asyncio.gather(
+        *(client.graphql(build_search_query(chunk)) for chunk in chunks), return_exceptions=True
+    )
+    logins = {}
+    for chunk, result in zip(chunks, responses):
+        if isinstance(result, Exception):
+            print(f"[!] Batch user lookup failed for {len(chunk)} emails: {result}", file=sys.stderr)
+            continue
+        data = result.get("data") or {}
+        for i, email in enumerate(chunk):
+            if data.get(f"u{i}") is not None:
+                logins[email] = parse_search_result(data[f"u{i}"])
+    return logins
+
+async def get_github_username_async(email, client):
+    """Single-email login search, for emails the batched search left out"""
+    result = await client.graphql(build_search_query([email]))
+    search = (result.get("data") or {}).get("u0")
+    return parse_search_result(search) if search is not None else None
+
+async def create_organization_async(email, enterprise_id, client, org_login=None, logins=None, timings=None):
+    if not is_valid_email(email):
+        return {"success": False, "message": "Invalid email address"}
+    org_login = org_login or generate_unique_org_name(email)
+    if logins is not None and email in logins:
+        github_username = logins[email]
+    else:
+        # Not resolved by the batched search, e.g. its batch failed
+        github_username = await get_github_username_async(email, client)
+    admin_logins = [github_username] if github_username else []
+
+    started = time.monotonic()
+    mutation = build_org_mutation(enterprise_id, org_login, org_login.replace("-", " "), email, admin_logins)
+    result = await client.graphql(mutation)
+    if timings is not None:
+        timings["org_seconds"] = round(time.monotonic() - started, 3)
+
+    for error in result.get("errors", []):
+        message = error.get("message", "").lower()
+        metrics.record_org(False)
+        if "already exists" in message or "organization name is not available" in message:
+            return {"success": False, "message": f"Organization '{org_login}' already exists. Please try a different name."}
+        return {"success": False, "message": f"Organization creation failed: {error.get('message')}"}
+    if not ((result.get("data") or {}).get("createEnterpriseOrganization") or {}).get("organization"):
+        metrics.record_org(False)
+        return {"success": False, "message": f"Organization creation failed: {result.get('message', 'no organization returned')}"}
+
+    metrics.record_org(True)
+    started = time.monotonic()
+    invite = await invite_user_async(email, org_login, client)
+    if timings is not None:
+        timings["invite_seconds"] = round(time.monotonic() - started, 3)
+    metrics.record_invite("id" in invite)
+    return {
+        "success": True,
+        "message": f"Organization '{org_login}' created successfully!",
+        "org_login": org_login
+    }
+
+async def invite_user_async(email, org_login, client):
+    with tracing.span("invite", email=email, org_login=org_login):
+        response = await client.post(f"orgs/{org_login}/invitations", json={"email": email, "role": "admin"})
+    if response.status_code != 201:
+        print(f"[!] Invite for {email} to {org_login} failed: {response.status_code}", file=sys.stderr)
+    return response.json()
+
+async def clone_repository_async(org_login, repo, source_org, github_token, client, templates, push_slots):
+    payload = {
+        "name": repo,
+        "private": True,
+        "description": f"Cloned from {source_org}/{repo}",
+        "auto_init": False
+    }
+    r = await client.post(f"orgs/{org_login}/repos", json=payload)
+    if r.status_code == 422 and "name already exists" in r.text:
+        return f"Repository '{repo}' already exists in {org_login}. Skipping creation."
+    if r.status_code != 201:
+        return f"Failed to create repository '{repo}' in {org_login}: {r.status_code} - {r.text}"
+
+    try:
+        repo_dir = await templates.path(repo)
+        async with push_slots:
+            push = await push_mirror_async(repo_dir, org_login, repo, github_token)
+    except Exception as e:
+        return f"Error cloning repository '{repo}': {e}"
+    return describe_push(push)
+
+async def provision_participant_async(email, client, enterprise_id, source_org, repos_to_clone, github_token,
+                                      templates, push_slots, logins=None, org_login=None):
+    """Async provision_participant: create the org, invite, then create and push the repos"""
+    started_at = time.time()
+    started = time.monotonic()
+    timings = {"started_at": started_at}
+
+    def finish(result):
+        timings["finished_at"] = time.time()
+        timings["total_seconds"] = round(time.monotonic() - started, 3)
+        result["timings"] = timings
+        return result
+
+    # A roster row without repos and no --repos default: nothing to put in the org
+    if not repos_to_clone:
+        return finish({"email": email, "success": False, "message": "No repositories specified"})
+
+    with tracing.span("create_organization", email=email):
+        create_result = await create_organization_async(email, enterprise_id, client, org_login, logins, timings)
+    if not create_result["success"]:
+        return finish({"email": email, "success": False, "message": create_result["message"]})
+
+    org_login = create_result["org_login"]
+    repos_started = time.monotonic()
+    try:
+        with tracing.span("clone_repositories", org_login=org_login, repos=len(repos_to_clone)):
+            # Repos of one org are created and pushed concurrently
+            outcomes = await asyncio.gather(*(
+                clone_repository_async(org_login, repo, source_org, github_token, client, templates, push_slots)
+                for repo in repos_to_clone
+            ), return_exceptions=True)
+        clone_results = [
+            f"Error cloning repository '{repo}': {outcome}" if isinstance(outcome, Exception) else outcome
+            for repo, outcome in zip(repos_to_clone, outcomes)
+        ]
+    except Exception as e:
+        clone_results = [f"Error cloning repositories: {e}"]
+    timings["repos_seconds"] = round(time.monotonic() - repos_started, 3)
+
+    return finish({
+        "email": email,
+        "organization": org_login,
+        "success": True,
+        "message": create_result["message"],
+        "repo_results": clone_results
+    })
+
+async def with_resolved_logins_async(participants, client, logins, batch_size=SEARCH_BATCH_SIZE):
+    """Async generator resolving logins a batch at a time as participants stream in
+
+    participants is a plain iterable such as read_roster(); each batch is read
+    on a worker thread so a slow file or stdin never blocks the event loop.
+    """
+    rows = iter(participants)
+    while True:
+        batch = await asyncio.to_thread(list, itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        logins.update(await resolve_logins_async([p["email"] for p in batch if is_valid_email(p["email"])], client))
+        for participant in batch:
+            yield participant
+
+async def provision_all(participants, concurrency=CONCURRENCY, **kwargs):
+    """Yield results as participants finish, keeping at most concurrency in flight
+
+    participants is an async iterable of dicts with an "email" and optional
+    per-row "org_login"/"repos_to_clone" overrides of kwargs. Each result
+    carries its input position as "index".
+    """
+    slots = asyncio.Semaphore(max(1, concurrency))
+    finished = asyncio.Queue()
+    tasks = set()
+
+    async def run(index, participant):
+        options = dict(kwargs)
+        options.update((key, value) for key, value in participant.items() if key != "email")
+        try:
+            result = await provision_participant_async(participant["email"], **options)
+        except Exception as e:
+            result = {"email": participant["email"], "success": False, "message": f"Provisioning failed: {e}"}
+        finally:
+            slots.release()
+        result["index"] = index
+        await finished.put(result)
+
+    submitted = yielded = 0
+    async for participant in participants:
+        await slots.acquire()
+        task = asyncio.create_task(run(submitted, participant))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        submitted += 1
+        while not finished.empty():
+            yield finished.get_nowait()
+            yielded += 1
+    while yielded < submitted:
+        yield await finished.get()
+        yielded += 1
+
+
+async def run_async(args, participants, repos_to_clone, output):
+    client = AsyncGitHubClient(args.token, max_connections=args.max_connections)
+    work_dir = tempfile.mkdtemp(prefix="workshop-templates-")
+    try:
+        logins = {}
+        results = provision_all(
+            with_resolved_logins_async(participants, client, logins),
+            concurrency=args.concurrency,
+            client=client,
+            enterprise_id=args.enterprise_id,
+            source_org=args.source_org,
+            repos_to_clone=repos_to_clone,
+            github_token=args.token,
+            templates=TemplateRepos(args.source_org, args.token, work_dir),
+            push_slots=asyncio.Semaphore(args.max_pushes),
+            logins=logins
+        )
+        if args.output == "jsonl":
+            async for result in results:
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+        else:
+            collected = [result async for result in results]
+            collected.sort(key=lambda result: result.pop("index"))
+            for result in collected:
+                result.pop("timings", None)
+            output.write(json.dumps({"success": True, "results": collected}, indent=2) + "\n")
+    finally:
+        await client.aclose()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub Workshop Orchestrator (asyncio)")
+    participants_group = parser.add_mutually_exclusive_group(required=True)
+    participants_group.add_argument("--emails", help="Comma-separated list of participant email addresses")
+    participants_group.add_argument("--roster", help="CSV or JSONL roster file with an email column ('-' for stdin)")
+    parser.add_argument("--roster-format", choices=["csv", "jsonl"], help="Roster format (default: from the file extension)")
+    parser.add_argument("--repos", help="Comma-separated list of repositories to clone")
+    parser.add_argument("--token", help="GitHub Personal Access Token")
+    parser.add_argument("--enterprise-id", help="Enterprise ID")
+    parser.add_argument("--source-org", default="Instance-test-org01", help="Source organization for template repos")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Participants in flight at once")
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS, help="Pooled connections to the GitHub API")
+    parser.add_argument("--max-pushes", type=int, default=MAX_PUSHES, help="Maximum git pushes running at the same time")
+    parser.add_argument("--api-base", help="GitHub API base URL (default: $GITHUB_API_BASE or https://api.github.com)")
+    parser.add_argument("--git-base", help="Base URL repos are cloned from and pushed to (default: $GITHUB_GIT_BASE or https://github.com)")
+    parser.add_argument("--dry-run", action="store_true", help="Provision against a local fake GitHub instead of the real one")
+    parser.add_argument("--output", choices=["json", "jsonl"], default="json",
+                        help="json prints one document at the end; jsonl writes a record per participant as it finishes")
+    parser.add_argument("--output-file", help="Write results here instead of stdout")
+    args = parser.parse_args()
+
+    fake = None
+    if args.dry_run:
+        from fake_github import FakeGitHub
+        fake = FakeGitHub().start()
+        # Also covers the early exits below; stop() is safe to call twice
+        atexit.register(fake.stop)
+        args.api_base = args.git_base = fake.base_url
+        args.token = args.token or "dry-run-token"
+        args.enterprise_id = args.enterprise_id or "dry-run-enterprise"
+        print(f"Dry run: fake GitHub at {fake.base_url} (repos in {fake.root})", file=sys.stderr)
+    elif not args.token or not args.enterprise_id:
+        parser.error("--token and --enterprise-id are required unless --dry-run is given")
+
+    if args.api_base:
+        set_api_base(args.api_base)
+    if args.git_base:
+        set_git_base(args.git_base)
+
+    repos_to_clone = [repo.strip() for repo in (args.repos or "").split(",") if repo.strip()]
+    if args.roster:
+        participants = read_roster(args.roster, fmt=args.roster_format, validate=is_valid_email)
+    else:
+        participants = [{"email": email.strip()} for email in args.emails.split(",") if email.strip()]
+        if not participants:
+            print("Error: No valid email addresses provided")
+            exit(1)
+    if not repos_to_clone and not args.roster:
+        print("Error: No repositories specified")
+        exit(1)
+
+    if fake:
+        participants = list(participants)
+        template_repos = set(repos_to_clone)
+        for participant in participants:
+            template_repos.update(participant.get("repos_to_clone") or [])
+        for repo in sorted(template_repos):
+            fake.seed(args.source_org, repo)
+
+    output = open(args.output_file, "a" if args.output == "jsonl" else "w", encoding="utf-8") if args.output_file else sys.stdout
+    try:
+        asyncio.run(run_async(args, participants, repos_to_clone, output))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if fake:
+            print(f"Dry run API calls: {json.dumps(fake.snapshot(), sort_keys=True)}", file=sys.stderr)
+            fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Compare per-call latency of bare requests.post against the pooled GitHubClient.
+
+Starts a keep-alive HTTP stub on localhost and fires the same POST at it
+through both paths. The stub speaks plain HTTP, so the saving shown is the
+TCP handshake only; against api.github.com each fresh connection also pays
+a TLS handshake. Run from the repository root:
+
+    python benchmarks/bench_http_session.py --calls 500
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from github_client import GitHubClient
+from rate_limiter import RateLimiter
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"data": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class UnpacedLimiter(RateLimiter):
+    """Never waits, so the timings show the transport rather than GitHub's pacing"""
+
+    def reserve(self, resource, write=False):
+        return 0.0
+
+
+def time_calls(send, calls):
+    """Return per-call latencies in milliseconds"""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        send()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    return {
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pooled session microbenchmark")
+    parser.add_argument("--calls", type=int, default=300, help="Requests per variant")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    payload = {"query": "query { viewer { login } }"}
+
+    bare = time_calls(
+        lambda: requests.post(f"{base}/graphql", headers={"Authorization": "Bearer x"}, json=payload),
+        args.calls
+    )
+    client = GitHubClient("x", api_base=base)
+    client.limiter = UnpacedLimiter()
+    pooled = time_calls(lambda: client.post("graphql", json=payload), args.calls)
+    client.close()
+    server.shutdown()
+
+    report = {"calls": args.calls, "bare_requests": summarize(bare), "pooled_session": summarize(pooled)}
+    report["saved_per_call_ms"] = round(report["bare_requests"]["mean_ms"] - report["pooled_session"]["mean_ms"], 3)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""End-to-end provisioning benchmark against the local fake GitHub.
+
+Runs workshop_orchestrator.main and the Flask /create_workshop endpoint over
+a matrix of participant counts, repos per participant and simulated API
+latency. Every scenario runs in its own subprocess so peak RSS is measured
+per scenario; the fake GitHub (fake_github.py) runs in this process so its
+own memory and git work stay out of the numbers. Run from the repository
+root:
+
+    python benchmarks/bench_provisioning.py --output bench.json
+    python benchmarks/bench_provisioning.py --participants 10 --compare bench.json
+
+The report is JSON: one entry per scenario with p50/p95 per step, wall
+time, peak RSS and API calls per participant. --compare exits non-zero when
+a scenario's wall time or p95 grew past --tolerance against a saved report.
+
+By default the client's rate pacing is switched off so the numbers show the
+provisioning steps themselves. --pacing github (or off,github) keeps
+GitHub's budgets, where 80 writes a minute bound any large scenario.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+from fake_github import FakeGitHub
+
+SOURCE_ORG = "bench-source"
+# Client environment per --pacing value; "off" lifts the request and write budgets
+PACING_ENV = {
+    "off": {"GITHUB_WRITES_PER_MINUTE": "1000000", "GITHUB_RATE_BURST": "1000000"},
+    "github": {},
+}
+# Stats keys that are not API calls
+NON_CALL_STATS = ("git.bytes_in", "git.bytes_out", "graphql.search_fields")
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))
+    return values[index]
+
+
+def summarize_steps(samples):
+    """samples maps step name -> list of seconds; returns p50/p95 in ms"""
+    return {
+        step: {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+        }
+        for step, values in sorted(samples.items()) if values
+    }
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# --- Scenario runners (executed in the child process) ---
+def run_cli(scenario, emails, work_dir):
+    import workshop_orchestrator
+
+    results_path = os.path.join(work_dir, "results.jsonl")
+    sys.argv = [
+        "workshop_orchestrator.py",
+        "--emails", ",".join(emails),
+        "--repos", ",".join(scenario["repo_names"]),
+        "--token", "bench-token",
+        "--enterprise-id", "bench-enterprise",
+        "--source-org", SOURCE_ORG,
+        "--concurrency", str(scenario["concurrency"]),
+        "--login-cache", os.path.join(work_dir, "logins.sqlite3"),
+        "--mirror-cache", os.path.join(work_dir, "mirrors"),
+        "--output", "jsonl",
+        "--output-file", results_path,
+    ]
+    workshop_orchestrator.main()
+
+    samples = {"org": [], "invite": [], "repos": [], "participant": []}
+    failures = 0
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            result = json.loads(line)
+            failures += not result.get("success")
+            timings = result.get("timings", {})
+            for step, key in (("org", "org_seconds"), ("invite", "invite_seconds"),
+                              ("repos", "repos_seconds"), ("participant", "total_seconds")):
+                if key in timings:
+                    samples[step].append(timings[key])
+    return samples, failures
+
+
+def run_flask(scenario, emails, work_dir):
+    os.environ["LOGIN_CACHE_PATH"] = os.path.join(work_dir, "logins.sqlite3")
+    os.environ["WORKSHOP_JOB_CONCURRENCY"] = str(scenario["concurrency"])
+    import app as flask_app
+
+    flask_app.SOURCE_ORG = SOURCE_ORG
+    flask_app.REPOS_TO_CLONE = scenario["repo_names"]
+    samples = {"org": [], "repos": [], "participant": []}
+
+    def timed(step, func):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples[step].append(time.perf_counter() - started)
+        return wrapper
+
+    flask_app.create_organization = timed("org", flask_app.create_organization)
+    flask_app.clone_repositories = timed("repos", flask_app.clone_repositories)
+    flask_app.provision_participant = timed("participant", flask_app.provision_participant)
+
+    http = flask_app.app.test_client()
+    response = http.post("/create_workshop", json={"emails": emails})
+    status_url = response.get_json()["status_url"]
+    while True:
+        job = http.get(status_url).get_json()
+        if job["status"] in ("finished", "failed"):
+            break
+        time.sleep(0.05)
+    failures = sum(1 for entry in job["results"] if entry["status"] != "done")
+    return samples, failures
+
+
+def run_scenario(scenario, report_path):
+    emails = [f"bench.user{i:05d}@example.com" for i in range(scenario["participants"])]
+    work_dir = tempfile.mkdtemp(prefix="bench-provisioning-")
+    runner = run_cli if scenario["target"] == "cli" else run_flask
+    try:
+        started = time.perf_counter()
+        samples, failures = runner(scenario, emails, work_dir)
+        wall = time.perf_counter() - started
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    peak_kb = peak_rss_kb()
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "wall_seconds": round(wall, 3),
+            "failures": failures,
+            "peak_rss_mb": round(peak_kb / 1024, 1),
+            "steps": summarize_steps(samples),
+        }, f)
+
+
+# --- Driver (executed in the parent process) ---
+def benchmark(scenario, python):
+    fake = FakeGitHub(latency_ms=scenario["latency_ms"], jitter_ms=scenario["latency_ms"] / 4).start()
+    report_path = os.path.join(fake.root, "scenario.json")
+    try:
+        for repo in scenario["repo_names"]:
+            fake.seed(SOURCE_ORG, repo, scenario["repo_size_kb"])
+
+        env = dict(os.environ, GITHUB_API_BASE=fake.base_url, GITHUB_GIT_BASE=fake.base_url,
+                   PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+        env.update(PACING_ENV[scenario["pacing"]])
+        spec = json.dumps(scenario)
+        proc = subprocess.run(
+            [python, os.path.abspath(__file__), "--run-scenario", spec, "--report", report_path],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        if proc.returncode != 0:
+            return dict(scenario, error=proc.stderr.strip().splitlines()[-1:] or ["unknown error"])
+
+        with open(report_path, encoding="utf-8") as f:
+            result = json.load(f)
+        stats = fake.snapshot()
+    finally:
+        fake.stop()
+
+    calls = {name: count for name, count in stats.items() if name not in NON_CALL_STATS}
+    api_calls = sum(count for name, count in calls.items() if not name.startswith("git."))
+    result.update(scenario)
+    result["api_calls"] = calls
+    result["api_calls_per_participant"] = round(api_calls / scenario["participants"], 2)
+    result["git_requests_per_participant"] = round(
+        sum(count for name, count in calls.items() if name.startswith("git.")) / scenario["participants"], 2)
+    return result
+
+
+def scenario_key(scenario):
+    # Reports saved before pacing was a dimension were all paced
+    return (scenario["target"], scenario["participants"], scenario["repos"], scenario["latency_ms"],
+            scenario.get("pacing", "github"))
+
+
+def compare(report, baseline_path, tolerance):
+    """Return human-readable regressions of report against a saved report"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {scenario_key(s): s for s in json.load(f)["scenarios"] if "error" not in s}
+
+    regressions = []
+    for scenario in report["scenarios"]:
+        before = baseline.get(scenario_key(scenario))
+        if before is None or "error" in scenario:
+            continue
+        checks = [("wall_seconds", scenario["wall_seconds"], before["wall_seconds"])]
+        for step, stats in scenario["steps"].items():
+            if step in before["steps"]:
+                checks.append((f"{step}.p95_ms", stats["p95_ms"], before["steps"][step]["p95_ms"]))
+        checks.append(("api_calls_per_participant", scenario["api_calls_per_participant"],
+                       before["api_calls_per_participant"]))
+        for metric, now, then in checks:
+            if then and now > then * (1 + tolerance):
+                regressions.append(f"{'/'.join(map(str, scenario_key(scenario)))} {metric}: {then} -> {now}")
+    return regressions
+
+
+def int_list(value):
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end provisioning benchmark")
+    parser.add_argument("--participants", type=int_list, default=[10, 100, 1000], help="Comma-separated participant counts")
+    parser.add_argument("--repos", type=int_list, default=[1, 3], help="Comma-separated repos-per-participant counts")
+    parser.add_argument("--latency-ms", type=int_list, default=[0, 50], help="Comma-separated simulated API latencies")
+    parser.add_argument("--targets", default="cli,flask", help="Comma-separated subset of cli,flask")
+    parser.add_argument("--pacing", default="off", help="Comma-separated subset of off,github: client rate pacing")
+    parser.add_argument("--concurrency", type=int, default=8, help="Participants provisioned in parallel")
+    parser.add_argument("--repo-size-kb", type=int, default=64, help="Size of each seeded template repo")
+    parser.add_argument("--output", help="Write the JSON report here as well as stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="Saved report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown for --compare")
+    parser.add_argument("--run-scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--report", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        run_scenario(json.loads(args.run_scenario), args.report)
+        return
+
+    scenarios = [
+        {
+            "target": target,
+            "participants": participants,
+            "repos": repos,
+            "repo_names": [f"Bench-Repo{i:02d}" for i in range(1, repos + 1)],
+            "latency_ms": latency,
+            "pacing": pacing,
+            "concurrency": args.concurrency,
+            "repo_size_kb": args.repo_size_kb,
+        }
+        for target in args.targets.split(",")
+        for participants in args.participants
+        for repos in args.repos
+        for latency in args.latency_ms
+        for pacing in args.pacing.split(",")
+    ]
+
+    results = []
+    for scenario in scenarios:
+        print(f"[*] {scenario['target']}: {scenario['participants']} participants, "
+              f"{scenario['repos']} repos, {scenario['latency_ms']}ms latency, pacing {scenario['pacing']}", file=sys.stderr)
+        results.append(benchmark(scenario, sys.executable))
+
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                            capture_output=True, text=True).stdout.strip()
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if any("error" in scenario for scenario in results):
+        sys.exit(1)
+    if args.compare:
+        regressions = compare(report, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"[!] Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
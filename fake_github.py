@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Local stand-in for the parts of GitHub the workshop scripts talk to.
+
+Implements the createEnterpriseOrganization, inviteEmail and user search
+GraphQL operations, POST /orgs/{org}/repos, POST /orgs/{org}/invitations,
+GitHub App installation tokens and git smart HTTP (through ``git http-backend``), with configurable
+latency and error injection. Run it on its own:
+
+    python fake_github.py --port 8787 --seed-repo Instance-test-org01/Java-Repo01
+
+and point the scripts at it with GITHUB_API_BASE / GITHUB_GIT_BASE set to
+http://127.0.0.1:8787, or use ``workshop_orchestrator.py --dry-run``.
+"""
+import os
+import re
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import Counter
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Helper Functions ---
+def init_bare_repo(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    subprocess.run(["git", "init", "--quiet", "--bare", path], check=True)
+
+def seed_repo(path, size_kb=0):
+    """Create a bare repo holding one commit (plus size_kb of random data)"""
+    init_bare_repo(path)
+    work_dir = tempfile.mkdtemp(prefix="fake-github-seed-")
+    try:
+        with open(os.path.join(work_dir, "README.md"), "w", encoding="utf-8") as f:
+            f.write(f"# {os.path.basename(path)[:-4]}\n")
+        if size_kb:
+            with open(os.path.join(work_dir, "payload.bin"), "wb") as f:
+                f.write(os.urandom(size_kb * 1024))
+        git = ["git", "-C", work_dir, "-c", "user.name=fake", "-c", "user.email=fake@example.com"]
+        subprocess.run(["git", "init", "--quiet", "-b", "main", work_dir], check=True)
+        subprocess.run(git + ["add", "."], check=True)
+        subprocess.run(git + ["commit", "--quiet", "-m", "Initial commit"], check=True)
+        subprocess.run(git + ["push", "--quiet", path, "main"], check=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+class FakeGitHub:
+    """In-process fake GitHub API and git server"""
+
+    def __init__(self, root=None, host="127.0.0.1", port=0, latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, rate_limit_rate=0.0, users=None, revoked_tokens=()):
+        # A temp root is the fake's own and is removed again by stop()
+        self.owns_root = root is None
+        self.root = root or tempfile.mkdtemp(prefix="fake-github-")
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        # email -> login; None means every email resolves to its local part
+        self.users = users
+        # Tokens answered with 401 Bad credentials
+        self.revoked_tokens = set(revoked_tokens)
+        self.orgs = set()
+        self.repos = set()
+        self.stats = Counter()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        handler = type("Handler", (FakeGitHubHandler,), {"fake": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread = None
+        self.server.server_close()
+        if self.owns_root:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    def seed(self, org, repo, size_kb=0):
+        with self._lock:
+            self.orgs.add(org)
+            self.repos.add((org, repo))
+        seed_repo(self.repo_path(org, repo), size_kb)
+
+    def repo_path(self, org, repo):
+        return os.path.join(self.root, org, f"{repo}.git")
+
+    def new_id(self):
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats)
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    fake = None
+
+    def log_message(self, *args):
+        pass
+
+    # --- plumbing ---
+    def read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def send(self, status, body=b"", content_type="application/json", headers=None):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def inject_faults(self):
+        """Apply configured latency; return True if an error response was sent"""
+        fake = self.fake
+        if fake.latency or fake.jitter:
+            time.sleep(max(0.0, fake.latency + random.uniform(-fake.jitter, fake.jitter)))
+        roll = random.random()
+        if roll < fake.rate_limit_rate:
+            fake.count("injected_rate_limit")
+            self.send(403, {"message": "You have exceeded a secondary rate limit."}, headers={"Retry-After": "1"})
+            return True
+        if roll < fake.rate_limit_rate + fake.error_rate:
+            fake.count("injected_error")
+            self.send(502, {"message": "Server Error"})
+            return True
+        return False
+
+    # --- routing ---
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/_stats":
+            return self.send(200, self.fake.snapshot())
+        if ".git/" in path:
+            return self.git_http_backend(b"")
+        if path == "/app/installations":
+            return self.send(200, [{"id": 1, "account": {"login": "fake-enterprise"}}])
+        if re.fullmatch(r"/(orgs/[^/]+|repos/[^/]+/[^/]+)/installation", path):
+            return self.send(200, {"id": 1})
+        self.send(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        body = self.read_body()
+        if ".git/" in path:
+            return self.git_http_backend(body)
+        token = self.headers.get("Authorization", "").split(" ", 1)[-1]
+        if token in self.fake.revoked_tokens:
+            self.fake.count("rejected_token")
+            return self.send(401, {"message": "Bad credentials"})
+        if self.inject_faults():
+            return
+
+        if path == "/graphql":
+            return self.graphql(json.loads(body or b"{}"))
+        if re.fullmatch(r"/app/installations/\d+/access_tokens", path):
+            self.fake.count("rest.installation_token")
+            expires_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 3600))
+            return self.send(201, {"token": f"ghs_fake{self.fake.new_id()}", "expires_at": expires_at})
+        match = re.fullmatch(r"/orgs/([^/]+)/(repos|invitations)", path)
+        if match:
+            org, kind = match.groups()
+            if org not in self.fake.orgs:
+                return self.send(404, {"message": "Not Found"})
+            payload = json.loads(body or b"{}")
+            return self.create_repo(org, payload) if kind == "repos" else self.invite(org, payload)
+        self.send(404, {"message": "Not Found"})
+
+    # --- GraphQL ---
+    def graphql(self, payload):
+        fake = self.fake
+        query = payload.get("query", "")
+
+        if "createEnterpriseOrganization" in query:
+            fake.count("graphql.createEnterpriseOrganization")
+            login = re.search(r'login:\s*"([^"]+)"', query).group(1)
+            with fake._lock:
+                exists = login in fake.orgs
+                fake.orgs.add(login)
+            if exists:
+                return self.send(200, {"errors": [{"message": "Login already exists"}]})
+            os.makedirs(os.path.join(fake.root, login), exist_ok=True)
+            org = {"id": f"O_{fake.new_id()}", "login": login, "name": login.replace("-", " ")}
+            return self.send(200, {"data": {"createEnterpriseOrganization": {"organization": org}}})
+
+        if "inviteEmail" in query:
+            fake.count("graphql.inviteEmail")
+            invitation = {"id": f"I_{fake.new_id()}"}
+            return self.send(200, {"data": {"inviteEmail": {"invitation": invitation}}})
+
+        searches = re.findall(r'(?:(\w+)\s*:\s*)?search\(query:\s*"([^"]+?) in:email"', query)
+        if searches:
+            fake.count("graphql.search")
+            with fake._lock:
+                fake.stats["graphql.search_fields"] += len(searches)
+            data = {}
+            for alias, email in searches:
+                login = email.split("@")[0].replace(".", "-") if fake.users is None else fake.users.get(email)
+                edges = [{"node": {"login": login}}] if login else []
+                data[alias or "search"] = {"userCount": len(edges), "edges": edges}
+            return self.send(200, {"data": data})
+
+        fake.count("graphql.unknown")
+        self.send(200, {"errors": [{"message": "Unsupported operation in fake GitHub"}]})
+
+    # --- REST ---
+    def create_repo(self, org, payload):
+        fake = self.fake
+        fake.count("rest.create_repo")
+        name = payload.get("name")
+        with fake._lock:
+            exists = (org, name) in fake.repos
+            fake.repos.add((org, name))
+        if exists:
+            return self.send(422, {
+                "message": "Repository creation failed.",
+                "errors": [{"resource": "Repository", "field": "name", "message": "name already exists on this account"}]
+            })
+        init_bare_repo(fake.repo_path(org, name))
+        self.send(201, {"id": fake.new_id(), "name": name, "full_name": f"{org}/{name}", "private": payload.get("private", False)})
+
+    def invite(self, org, payload):
+        self.fake.count("rest.invite")
+        self.send(201, {"id": self.fake.new_id(), "email": payload.get("email"), "role": payload.get("role")})
+
+    # --- git smart HTTP ---
+    def git_http_backend(self, body):
+        fake = self.fake
+        url = urlsplit(self.path)
+        fake.count("git." + url.path.rsplit("/", 1)[-1])
+        env = {
+            "PATH": os.environ.get("PATH", ""),
+            "GIT_PROJECT_ROOT": fake.root,
+            "GIT_HTTP_EXPORT_ALL": "1",
+            # http-backend only enables receive-pack for authenticated users
+            "REMOTE_USER": "x-access-token",
+            "REQUEST_METHOD": self.command,
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+            "CONTENT_LENGTH": str(len(body)),
+            "HTTP_CONTENT_ENCODING": self.headers.get("Content-Encoding", ""),
+            "GIT_PROTOCOL": self.headers.get("Git-Protocol", ""),
+        }
+        result = subprocess.run(["git", "http-backend"], input=body, env=env, capture_output=True)
+        head, _, payload = result.stdout.partition(b"\r\n\r\n")
+        status = 200
+        headers = {}
+        for line in head.decode("latin-1").split("\r\n"):
+            if ":" not in line:
+                continue
+            name, value = line.split(":", 1)
+            if name.lower() == "status":
+                status = int(value.strip().split()[0])
+            else:
+                headers[name.strip()] = value.strip()
+        with fake._lock:
+            fake.stats["git.bytes_in"] += len(body)
+            fake.stats["git.bytes_out"] += len(payload)
+        content_type = headers.pop("Content-Type", "application/octet-stream")
+        self.send(status, payload, content_type=content_type, headers=headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake GitHub API and git server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--root", help="Directory for fake org repos (default: a temp dir)")
+    parser.add_argument("--seed-repo", action="append", default=[], metavar="ORG/REPO",
+                        help="Template repo to create with one commit (repeatable)")
+    parser.add_argument("--seed-size-kb", type=int, default=0, help="Random payload added to each seeded repo")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added latency per API call")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Uniform jitter around --latency-ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API calls answered with 502")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="Fraction of API calls answered with a secondary rate-limit 403")
+    parser.add_argument("--revoked-token", action="append", default=[], help="Token to answer with 401 (repeatable)")
+    args = parser.parse_args()
+
+    fake = FakeGitHub(root=args.root, host=args.host, port=args.port, latency_ms=args.latency_ms,
+                      jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                      rate_limit_rate=args.rate_limit_rate, revoked_tokens=args.revoked_token)
+    for spec in args.seed_repo:
+        org, repo = spec.split("/", 1)
+        fake.seed(org, repo, args.seed_size_kb)
+
+    print(f"Fake GitHub listening on {fake.base_url} (repos in {fake.root})")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
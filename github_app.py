@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import threading
+from datetime import datetime
+import requests
+import github_client
+
+try:
+    import jwt
+except ImportError:
+    jwt = None
+
+# --- Config ---
+APP_ID = os.environ.get("GITHUB_APP_ID")
+INSTALLATION_ID = os.environ.get("GITHUB_APP_INSTALLATION_ID")
+PRIVATE_KEY = os.environ.get("GITHUB_APP_PRIVATE_KEY")
+PRIVATE_KEY_PATH = os.environ.get("GITHUB_APP_PRIVATE_KEY_PATH")
+# Installation tokens live for an hour; replace them this many seconds early
+REFRESH_MARGIN = int(os.environ.get("GITHUB_APP_REFRESH_MARGIN", "300"))
+# GitHub rejects app JWTs valid for more than 10 minutes
+JWT_LIFETIME = 540
+RETRY_DELAY = 30
+
+
+class GitHubAppAuth:
+    """Installation-token provider for a GitHub App
+
+    token() returns a cached installation token and only talks to GitHub
+    when there is none yet or it is within refresh_margin of expiring.
+    After the first fetch a daemon thread swaps in a new token ahead of
+    expiry, so callers on the hot path never wait for a refresh. Pass an
+    instance wherever a token string is accepted by get_client().
+    """
+
+    def __init__(self, app_id, private_key, installation_id=None, installation_owner=None,
+                 api_base=None, refresh_margin=REFRESH_MARGIN, background=True):
+        if jwt is None:
+            raise RuntimeError("GitHub App auth needs PyJWT: pip install 'PyJWT[crypto]'")
+        self.app_id = str(app_id)
+        self.private_key = private_key
+        self.installation_id = installation_id
+        # "org" or "owner/repo" used to look the installation up when no id is given
+        self.installation_owner = installation_owner
+        self.api_base = api_base
+        self.refresh_margin = refresh_margin
+        self.background = background
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __str__(self):
+        return f"app {self.app_id}"
+
+    def url(self, path):
+        return f"{(self.api_base or github_client.API_BASE).rstrip('/')}/{path.lstrip('/')}"
+
+    def app_jwt(self):
+        """A short-lived JWT identifying the app itself"""
+        now = int(time.time())
+        # Backdated a minute to allow for clock drift
+        payload = {"iat": now - 60, "exp": now + JWT_LIFETIME, "iss": self.app_id}
+        return jwt.encode(payload, self.private_key, algorithm="RS256")
+
+    def app_request(self, method, path):
+        headers = {"Authorization": f"Bearer {self.app_jwt()}", "Accept": github_client.GRAPHQL_ACCEPT}
+        response = requests.request(method, self.url(path), headers=headers,
+                                    timeout=(github_client.CONNECT_TIMEOUT, github_client.READ_TIMEOUT))
+        response.raise_for_status()
+        return response.json()
+
+    def find_installation(self):
+        if self.installation_owner and "/" in self.installation_owner:
+            return str(self.app_request("GET", f"repos/{self.installation_owner}/installation")["id"])
+        if self.installation_owner:
+            return str(self.app_request("GET", f"orgs/{self.installation_owner}/installation")["id"])
+        installations = self.app_request("GET", "app/installations")
+        if not installations:
+            raise RuntimeError(f"GitHub App {self.app_id} has no installations")
+        return str(installations[0]["id"])
+
+    def refresh(self):
+        """Exchange a fresh JWT for a new installation token"""
+        if not self.installation_id:
+            self.installation_id = self.find_installation()
+        result = self.app_request("POST", f"app/installations/{self.installation_id}/access_tokens")
+        expires_at = datetime.fromisoformat(result["expires_at"].replace("Z", "+00:00")).timestamp()
+        with self._lock:
+            self._token = result["token"]
+            self._expires_at = expires_at
+        return result["token"]
+
+    def cached_token(self):
+        with self._lock:
+            if self._token and time.time() < self._expires_at - self.refresh_margin:
+                return self._token
+            return None
+
+    def token(self):
+        token = self.cached_token()
+        if token:
+            return token
+        with self._refresh_lock:
+            # Another caller may have refreshed while this one waited
+            token = self.cached_token() or self.refresh()
+            if self.background and self._thread is None:
+                self._thread = threading.Thread(target=self._refresh_loop, name="github-app-refresh", daemon=True)
+                self._thread.start()
+        return token
+
+    def invalidate(self):
+        """Drop the cached token, e.g. after GitHub answered it with 401"""
+        with self._lock:
+            self._token = None
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            with self._lock:
+                # Well before token() would start refreshing on the caller's time
+                delay = self._expires_at - 2 * self.refresh_margin - time.time()
+            if self._stop.wait(max(0.0, delay)):
+                return
+            try:
+                with self._refresh_lock:
+                    self.refresh()
+            except Exception as e:
+                print(f"[!] GitHub App token refresh failed: {e}", file=sys.stderr)
+                self._stop.wait(RETRY_DELAY)
+
+    def stop(self):
+        self._stop.set()
+
+
+def read_private_key(value=None, path=None):
+    """A PEM key given inline (with literal \\n allowed) or as a file path"""
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    if value:
+        return value.replace("\\n", "\n")
+    return None
+
+
+def app_auth_from_env(installation_owner=None, **kwargs):
+    """GitHubAppAuth from GITHUB_APP_* environment variables, or None if unset"""
+    private_key = read_private_key(PRIVATE_KEY, PRIVATE_KEY_PATH)
+    if not APP_ID or not private_key:
+        return None
+    return GitHubAppAuth(APP_ID, private_key, installation_id=INSTALLATION_ID or None,
+                         installation_owner=installation_owner, **kwargs)
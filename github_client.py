@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+import time
+import threading
+import requests
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from rate_limiter import RateLimiter, resource_for, MAX_RETRIES
+import tracing
+import metrics
+
+# --- Config ---
+API_BASE = os.environ.get("GITHUB_API_BASE", "https://api.github.com")
+POOL_SIZE = int(os.environ.get("GITHUB_POOL_SIZE", "20"))
+CONNECT_TIMEOUT = float(os.environ.get("GITHUB_CONNECT_TIMEOUT", "10"))
+READ_TIMEOUT = float(os.environ.get("GITHUB_READ_TIMEOUT", "60"))
+
+GRAPHQL_ACCEPT = "application/vnd.github+json"
+REST_ACCEPT = "application/vnd.github.v3+json"
+
+# First field of a GraphQL document, skipping an alias: "mutation { createEnterpriseOrganization(" / "{ u0: search("
+GRAPHQL_FIELD = re.compile(r"\{\s*(?:\w+\s*:\s*)?(\w+)")
+
+
+def endpoint_for(path, kwargs):
+    """API path of a call, with the GraphQL root field appended for /graphql"""
+    endpoint = urlsplit(path).path if "://" in path else "/" + path.lstrip("/")
+    payload = kwargs.get("json")
+    query = payload.get("query") if isinstance(payload, dict) else None
+    if query:
+        match = GRAPHQL_FIELD.search(query)
+        if match:
+            endpoint = f"{endpoint} {match.group(1)}"
+    return endpoint
+
+
+def is_write(method, resource, kwargs):
+    """Whether a call counts against the secondary limit on content-creating requests
+
+    GraphQL reads are POSTs too; only mutations create anything.
+    """
+    if resource == "graphql":
+        query = (kwargs.get("json") or {}).get("query", "")
+        return query.lstrip().startswith("mutation")
+    return method != "GET"
+
+
+def span_attributes(method, endpoint, response, attempts):
+    """Describe a finished API call for its trace span"""
+    # requests keeps the sent body on .body, httpx on .content
+    body = getattr(response.request, "body", None) or getattr(response.request, "content", None) or b""
+    return {
+        "http.method": method,
+        "http.endpoint": endpoint,
+        "http.status_code": response.status_code,
+        "http.request_bytes": len(body),
+        "http.response_bytes": len(response.content),
+        "github.attempts": attempts,
+    }
+
+
+def token_value(token):
+    """The token string for a PAT or for a provider such as GitHubAppAuth"""
+    return token if isinstance(token, str) else token.token()
+
+
+def describe_token(token):
+    """Identify a token in logs without revealing it"""
+    return f"...{token[-4:]}" if isinstance(token, str) else str(token)
+
+
+class GitHubClient:
+    """GitHub API client holding one pooled keep-alive session
+
+    token is a PAT string or a provider with a token() method (e.g.
+    GitHubAppAuth), which is asked for the current token on every call.
+    """
+
+    def __init__(self, token, api_base=None, pool_size=POOL_SIZE,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+        self.token = token
+        self.auth = None if isinstance(token, str) else token
+        self.api_base = (api_base or API_BASE).rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.limiter = RateLimiter()
+        # Health, read by TokenPool: a 401 means the token is revoked or expired
+        self.unauthorized = False
+        self.consecutive_errors = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": REST_ACCEPT})
+        if self.auth is None:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def url(self, path):
+        """Return the absolute URL for an API path"""
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.api_base}/{path.lstrip('/')}"
+
+    def request(self, method, path, write=None, **kwargs):
+        """Send a request through the pooled session, paced by the rate limiter
+
+        Rate-limited responses (429, secondary-limit 403s) are retried with
+        backoff up to MAX_RETRIES times before being returned to the caller.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        resource = resource_for(path)
+        if write is None:
+            write = is_write(method, resource, kwargs)
+
+        endpoint = None
+        with tracing.span("github.request") as span:
+            if span.recording or metrics.available:
+                endpoint = endpoint_for(path, kwargs)
+            for attempt in range(MAX_RETRIES + 1):
+                if self.auth is not None:
+                    kwargs["headers"] = dict(kwargs.get("headers") or {}, Authorization=f"Bearer {self.auth.token()}")
+                self.limiter.acquire(resource, write=write)
+                started = time.monotonic()
+                response = self.session.request(method, self.url(path), **kwargs)
+                elapsed = time.monotonic() - started
+                self.limiter.update(resource, response)
+                if response.status_code == 401 and self.auth is not None and attempt == 0:
+                    # The cached installation token may have been revoked; fetch a new one
+                    self.auth.invalidate()
+                    continue
+                self.track_health(response)
+                if metrics.available:
+                    metrics.record_api_call(method, endpoint, response.status_code, elapsed, self.limiter.budget())
+                if attempt == MAX_RETRIES or not self.limiter.is_rate_limited(response):
+                    break
+                self.limiter.backoff(response, attempt)
+            if span.recording:
+                span.set(**span_attributes(method, endpoint, response, attempt + 1))
+            return response
+
+    def track_health(self, response):
+        if response.status_code == 401 and not self.unauthorized:
+            self.unauthorized = True
+            print(f"[!] GitHub rejected token {describe_token(self.token)} (401); it will not be used again", file=sys.stderr)
+        if response.status_code >= 500:
+            self.consecutive_errors += 1
+        else:
+            self.consecutive_errors = 0
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def graphql(self, query, variables=None):
+        """Run a GraphQL document and return the decoded response body"""
+        payload = {"query": query}
+        if variables:
+            payload["variables"] = variables
+        response = self.post("graphql", headers={"Accept": GRAPHQL_ACCEPT}, json=payload)
+        return response.json()
+
+    def rate_limit_budget(self):
+        return self.limiter.budget()
+
+    def close(self):
+        self.session.close()
+
+
+# --- Shared clients ---
+_clients = {}
+_clients_lock = threading.Lock()
+
+def set_api_base(api_base):
+    """Change the API base used by clients created from now on"""
+    global API_BASE
+    API_BASE = api_base.rstrip("/")
+
+def get_client(token, **kwargs):
+    """Return the process-wide client for a token, creating it on first use"""
+    key = (token, kwargs.get("api_base") or API_BASE)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = GitHubClient(token, **kwargs)
+            _clients[key] = client
+        return client
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Config ---
+JOB_WORKERS = int(os.environ.get("WORKSHOP_JOB_WORKERS", "2"))
+JOB_CONCURRENCY = int(os.environ.get("WORKSHOP_JOB_CONCURRENCY", "4"))
+MAX_FINISHED_JOBS = 100
+
+
+class JobManager:
+    """Runs workshop provisioning in the background and tracks per-email progress
+
+    submit() returns a job id straight away; get() returns a snapshot that
+    the UI polls. Each job provisions its participants on a small pool so
+    one large roster does not hold a request worker for minutes.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, concurrency=JOB_CONCURRENCY):
+        self.concurrency = max(1, concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="workshop-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, emails, provision, prepare=None, listener=None, keep_results=True):
+        """Queue a job; provision(email, **prepare(emails)) runs once per email
+
+        listener, if given, is called with a "participant" event as each
+        email finishes and a "job" event at the end. With keep_results=False
+        the job only tracks per-email status and leaves the full results to
+        the listener.
+        """
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "created_at": time.time(),
+            "finished_at": None,
+            "results": [{"email": email, "status": "pending"} for email in emails]
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            self._forget_old_jobs()
+        self._executor.submit(self._run, job, provision, prepare, listener, keep_results)
+        return job_id
+
+    def get(self, job_id):
+        """Return a copy of a job's current state, or None if it is unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job, results=[dict(entry) for entry in job["results"]])
+        snapshot["total"] = len(snapshot["results"])
+        snapshot["completed"] = sum(1 for entry in snapshot["results"] if entry["status"] in ("done", "failed"))
+        return snapshot
+
+    def active_count(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job["status"] in ("queued", "running"))
+
+    def _update(self, job, index, **fields):
+        with self._lock:
+            job["results"][index].update(fields)
+
+    def _run_one(self, job, index, provision, context, listener, keep_results):
+        email = job["results"][index]["email"]
+        self._update(job, index, status="running")
+        try:
+            result = provision(email, **context)
+        except Exception as e:
+            result = {"email": email, "success": False, "message": f"Provisioning failed: {e}"}
+        status = "done" if result.get("success") else "failed"
+        if keep_results:
+            self._update(job, index, status=status, **result)
+        else:
+            self._update(job, index, status=status, success=result.get("success"))
+        if listener:
+            listener(dict(result, type="participant", status=status))
+
+    def _run(self, job, provision, prepare, listener, keep_results):
+        with self._lock:
+            job["status"] = "running"
+        try:
+            context = prepare([entry["email"] for entry in job["results"]]) if prepare else {}
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                for index in range(len(job["results"])):
+                    pool.submit(self._run_one, job, index, provision, context, listener, keep_results)
+            status = "finished"
+        except Exception as e:
+            print(f"[!] Job {job['id']} failed: {e}")
+            status = "failed"
+        with self._lock:
+            job["status"] = status
+            job["finished_at"] = time.time()
+        if listener:
+            listener({"type": "job", "job_id": job["id"], "status": status})
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["finished_at"] is not None]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+def format_sse(event, data):
+    """Encode one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
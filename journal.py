@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import threading
+
+# Step states
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class ProvisioningJournal:
+    """Append-only JSONL record of each participant's provisioning steps
+
+    Every state change is written as one line and fsynced before the call
+    returns, so after a crash the journal says exactly which orgs were
+    created, invited and populated. Reopening an existing journal replays
+    it; the latest line for each (email, step) wins.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._steps = {}
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-write
+                        continue
+                    self._steps[(entry["email"], entry["step"])] = entry
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, email, step, status, **fields):
+        """Durably append a step's new state"""
+        entry = {"ts": time.time(), "email": email, "step": step, "status": status}
+        entry.update(fields)
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._steps[(email, step)] = entry
+
+    def get(self, email, step):
+        with self._lock:
+            return self._steps.get((email, step))
+
+    def is_done(self, email, step):
+        entry = self.get(email, step)
+        return entry is not None and entry["status"] == DONE
+
+    def for_participant(self, email):
+        return ParticipantJournal(self, email)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class ParticipantJournal:
+    """A ProvisioningJournal view scoped to one participant's email"""
+
+    def __init__(self, journal, email):
+        self.journal = journal
+        self.email = email
+
+    def record(self, step, status, **fields):
+        self.journal.record(self.email, step, status, **fields)
+
+    def get(self, step):
+        return self.journal.get(self.email, step)
+
+    def is_done(self, step):
+        return self.journal.is_done(self.email, step)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# --- Config ---
+CACHE_PATH = os.environ.get(
+    "LOGIN_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "workshop-orchestrator", "logins.sqlite3")
+)
+POSITIVE_TTL = int(os.environ.get("LOGIN_CACHE_POSITIVE_TTL", str(30 * 24 * 3600)))
+NEGATIVE_TTL = int(os.environ.get("LOGIN_CACHE_NEGATIVE_TTL", str(24 * 3600)))
+MEMORY_SIZE = 4096
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+class LoginCache:
+    """Email -> GitHub login cache on SQLite with an in-memory LRU in front
+
+    Found logins and "no such user" answers are both stored, each with its
+    own TTL, so repeat runs skip the search API for every known email.
+    """
+
+    def __init__(self, path=CACHE_PATH, positive_ttl=POSITIVE_TTL,
+                 negative_ttl=NEGATIVE_TTL, memory_size=MEMORY_SIZE):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS logins ("
+            " email TEXT PRIMARY KEY,"
+            " login TEXT,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def _remember(self, email, login, expires_at):
+        self._memory[email] = (login, expires_at)
+        self._memory.move_to_end(email)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def lookup(self, email):
+        """Return (hit, login); login is None for a cached negative lookup"""
+        email = normalize_email(email)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(email)
+            if entry is None:
+                row = self._db.execute(
+                    "SELECT login, expires_at FROM logins WHERE email = ?", (email,)
+                ).fetchone()
+                if row is None:
+                    return False, None
+                entry = (row[0], row[1])
+
+            login, expires_at = entry
+            if expires_at <= now:
+                self._memory.pop(email, None)
+                return False, None
+            self._remember(email, login, expires_at)
+            return True, login
+
+    def store_many(self, logins):
+        """Store an email -> login map; None values are negative lookups"""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for email, login in logins.items():
+                email = normalize_email(email)
+                ttl = self.positive_ttl if login else self.negative_ttl
+                rows.append((email, login, now + ttl))
+                self._remember(email, login, now + ttl)
+            self._db.executemany(
+                "INSERT OR REPLACE INTO logins (email, login, expires_at) VALUES (?, ?, ?)",
+                rows
+            )
+            self._db.commit()
+
+    def store(self, email, login):
+        self.store_many({email: login})
+
+    def purge_expired(self):
+        """Drop expired rows from disk"""
+        with self._lock:
+            self._db.execute("DELETE FROM logins WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
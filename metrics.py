@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Prometheus metrics for provisioning throughput.
+
+prometheus_client is optional: without it every record_* call is a no-op
+and render() reports that metrics are unavailable.
+"""
+import re
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:
+    prometheus_client = None
+
+available = prometheus_client is not None
+
+# GitHub calls take tens of milliseconds to a few seconds; pushes up to minutes
+API_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PUSH_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+PUSH_BYTE_BUCKETS = tuple(2 ** power for power in range(16, 34, 2))
+
+if available:
+    ORGS_CREATED = Counter("workshop_orgs_created_total", "Organization creation attempts", ["result"])
+    INVITES_SENT = Counter("workshop_invites_sent_total", "Organization invitations sent", ["result"])
+    REPOS_PUSHED = Counter("workshop_repos_pushed_total", "Template repository pushes", ["result"])
+    API_LATENCY = Histogram("workshop_github_api_seconds", "GitHub API call latency",
+                            ["method", "endpoint", "status"], buckets=API_BUCKETS)
+    RATE_LIMIT_REMAINING = Gauge("workshop_github_rate_limit_remaining",
+                                 "Requests left in the current rate-limit window", ["resource"])
+    PUSH_SECONDS = Histogram("workshop_git_push_seconds", "git push --mirror duration", buckets=PUSH_BUCKETS)
+    # On-disk size of the local repo, not the bytes git sent over the wire
+    PUSHED_REPO_BYTES = Histogram("workshop_pushed_repo_size_bytes", "On-disk size of pushed template repositories",
+                                  buckets=PUSH_BYTE_BUCKETS)
+    ACTIVE_JOBS = Gauge("workshop_active_jobs", "Provisioning jobs queued or running")
+
+
+def endpoint_label(endpoint):
+    """Collapse org and repo names so the endpoint label stays low-cardinality"""
+    endpoint = re.sub(r"^/repos/[^/]+/[^/]+", "/repos/{owner}/{repo}", endpoint)
+    return re.sub(r"^/orgs/[^/]+", "/orgs/{org}", endpoint)
+
+
+def result_label(success):
+    return "success" if success else "failure"
+
+
+# --- Recording ---
+def record_api_call(method, endpoint, status, seconds, budget=None):
+    if not available:
+        return
+    API_LATENCY.labels(method, endpoint_label(endpoint), str(status)).observe(seconds)
+    for resource, values in (budget or {}).items():
+        if values.get("remaining") is not None:
+            RATE_LIMIT_REMAINING.labels(resource).set(values["remaining"])
+
+def record_org(success):
+    if available:
+        ORGS_CREATED.labels(result_label(success)).inc()
+
+def record_invite(success):
+    if available:
+        INVITES_SENT.labels(result_label(success)).inc()
+
+def record_push(success, seconds, size_bytes=None):
+    if not available:
+        return
+    REPOS_PUSHED.labels(result_label(success)).inc()
+    PUSH_SECONDS.observe(seconds)
+    if size_bytes is not None:
+        PUSHED_REPO_BYTES.observe(size_bytes)
+
+def track_active_jobs(active_count):
+    """Report active_count() as the active jobs gauge on every scrape"""
+    if available:
+        ACTIVE_JOBS.set_function(active_count)
+
+
+# --- Exposition ---
+def render():
+    """Return (body, status, content type) for a /metrics response"""
+    if not available:
+        return "prometheus_client is not installed\n", 501, "text/plain"
+    return prometheus_client.generate_latest(), 200, prometheus_client.CONTENT_TYPE_LATEST
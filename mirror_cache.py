@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+import os
+import re
+import stat
+import shutil
+import functools
+import threading
+import subprocess
+import tracing
+from github_client import token_value
+
+# --- Config ---
+CACHE_DIR = os.environ.get(
+    "MIRROR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "workshop-orchestrator", "mirrors")
+)
+MAX_BYTES = int(os.environ.get("MIRROR_CACHE_MAX_BYTES", str(5 * 1024 ** 3)))
+GIT_BASE = os.environ.get("GITHUB_GIT_BASE", "https://github.com")
+
+# Only branches and tags are copied; GitHub refuses pushes to refs/pull/*
+REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+
+# --- Helper Functions ---
+def set_git_base(git_base):
+    """Point every git URL at another host, e.g. a local GitHub stand-in"""
+    global GIT_BASE
+    GIT_BASE = git_base.rstrip("/")
+
+def repo_url(org, repo):
+    return f"{GIT_BASE}/{org}/{repo}.git"
+
+def authenticated_url(org, repo, github_token):
+    scheme, rest = GIT_BASE.split("://", 1)
+    return f"{scheme}://x-access-token:{github_token}@{rest}/{org}/{repo}.git"
+
+def git_subcommand(args):
+    """The git verb in an argument list, skipping -C/-c options"""
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in ("-C", "-c"):
+            skip = True
+        elif not arg.startswith("-"):
+            return arg
+    return "git"
+
+def git_remote(args):
+    """The remote URL in an argument list, with any credentials removed"""
+    for arg in args:
+        if "://" in arg:
+            return re.sub(r"//[^/@]+@", "//", arg)
+    return None
+
+def run_git(args, github_token=None, cwd=None):
+    """Run a git command and raise RuntimeError with its stderr on failure"""
+    subcommand = git_subcommand(args)
+    with tracing.span(f"git {subcommand}") as span:
+        result = subprocess.run(["git"] + args, cwd=cwd, capture_output=True, text=True)
+        if span.recording:
+            span.set(**{"git.returncode": result.returncode, "git.remote": git_remote(args) or ""})
+            if subcommand == "clone" and result.returncode == 0:
+                span.set(**{"git.bytes": directory_size(os.path.join(cwd or "", args[-1]))})
+    if result.returncode != 0:
+        stderr = result.stderr.strip()
+        if github_token:
+            stderr = stderr.replace(github_token, "***")
+        raise RuntimeError(f"git {subcommand} failed ({result.returncode}): {stderr}")
+    return result
+
+def force_remove(path):
+    """Remove a directory tree, clearing read-only bits first (for Windows)"""
+    def force_remove_readonly(func, path, _):
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+
+    shutil.rmtree(path, onerror=force_remove_readonly)
+
+def directory_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                pass
+    return total
+
+def repository_size(path):
+    """directory_size() of a local repo, walked once per modification time
+
+    A mirror pushed to many orgs is measured on its first push only.
+    """
+    return _repository_size(path, os.stat(path).st_mtime_ns)
+
+@functools.lru_cache(maxsize=256)
+def _repository_size(path, mtime_ns):
+    return directory_size(path)
+
+
+class MirrorCache:
+    """Persistent local bare copies of template repositories
+
+    Each repo is cloned once, refreshed with ``git fetch --prune`` at most
+    once per MirrorCache instance (one instance per run), and pushed to new
+    orgs straight from disk. The least recently used mirrors are evicted
+    once the cache grows past max_bytes.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._refreshed = set()
+        self._locks = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def mirror_path(self, source_org, repo):
+        return os.path.join(self.root, source_org, f"{repo}.git")
+
+    def _repo_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def ensure(self, source_org, repo, github_token):
+        """Return the path of an up-to-date local mirror of source_org/repo"""
+        key = (source_org, repo)
+        path = self.mirror_path(source_org, repo)
+        github_token = token_value(github_token)
+        source_url = authenticated_url(source_org, repo, github_token)
+
+        with self._repo_lock(key):
+            if key in self._refreshed:
+                return path
+
+            if os.path.isdir(path):
+                run_git(["-C", path, "fetch", "--prune", source_url] + REFSPECS, github_token)
+            else:
+                # Clone next to the final location and rename, so an
+                # interrupted clone never looks like a usable mirror
+                partial = f"{path}.partial"
+                if os.path.isdir(partial):
+                    force_remove(partial)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                run_git(["clone", "--bare", source_url, partial], github_token)
+                # Keep the token out of the cached repo's config
+                run_git(["-C", partial, "remote", "set-url", "origin", repo_url(source_org, repo)])
+                os.replace(partial, path)
+
+            os.utime(path)
+            self._refreshed.add(key)
+
+        self.evict()
+        return path
+
+    def evict(self):
+        """Delete least recently used mirrors until the cache fits in max_bytes"""
+        with self._lock:
+            in_use = {self.mirror_path(*key) for key in self._refreshed}
+            mirrors = []
+            for org in os.listdir(self.root):
+                org_dir = os.path.join(self.root, org)
+                if not os.path.isdir(org_dir):
+                    continue
+                for name in os.listdir(org_dir):
+                    path = os.path.join(org_dir, name)
+                    if name.endswith(".git") and os.path.isdir(path):
+                        mirrors.append((os.path.getmtime(path), path, directory_size(path)))
+
+            total = sum(size for _, _, size in mirrors)
+            for _, path, size in sorted(mirrors):
+                if total <= self.max_bytes:
+                    break
+                if path in in_use:
+                    continue
+                force_remove(path)
+                total -= size
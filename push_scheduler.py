@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import os
+import time
+import subprocess
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from mirror_cache import authenticated_url, repository_size
+import tracing
+import metrics
+from github_client import token_value
+
+# --- Config ---
+MAX_PUSHES = int(os.environ.get("GIT_MAX_PUSHES", "8"))
+
+# --- Helper Functions ---
+def push_mirror(repo_dir, org_login, repo, github_token):
+    """Run git push --mirror from a local bare repo and report how it went"""
+    # Resolved here so a queued push uses a token that is current when it runs
+    github_token = token_value(github_token)
+    push_url = authenticated_url(org_login, repo, github_token)
+    start = time.monotonic()
+    with tracing.span("git push", **{"git.remote": f"{org_login}/{repo}"}) as span:
+        result = subprocess.run(
+            ["git", "-C", repo_dir, "push", "--mirror", push_url],
+            capture_output=True,
+            text=True
+        )
+        size_bytes = repository_size(repo_dir) if span.recording or metrics.available else None
+        if span.recording:
+            span.set(**{"git.returncode": result.returncode, "git.bytes": size_bytes})
+    metrics.record_push(result.returncode == 0, time.monotonic() - start, size_bytes)
+    stderr = result.stderr.strip()
+    if github_token:
+        stderr = stderr.replace(github_token, "***")
+    return {
+        "org_login": org_login,
+        "repo": repo,
+        "returncode": result.returncode,
+        "stderr": stderr,
+        "duration": time.monotonic() - start
+    }
+
+def describe_push(push):
+    """Turn a push result into a repo_results line"""
+    if push["returncode"] == 0:
+        return (f"Successfully cloned repository '{push['repo']}' to {push['org_login']} "
+                f"(pushed in {push['duration']:.1f}s)")
+    return (f"Failed to push repository '{push['repo']}' to {push['org_login']}: "
+            f"git exited with {push['returncode']} after {push['duration']:.1f}s - {push['stderr']}")
+
+
+class PushScheduler:
+    """Runs git push --mirror jobs in parallel with a cap on concurrent pushes"""
+
+    def __init__(self, max_pushes=MAX_PUSHES):
+        self.max_pushes = max(1, max_pushes)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_pushes, thread_name_prefix="git-push")
+
+    def submit(self, repo_dir, org_login, repo, github_token):
+        """Queue one push and return a Future for its result"""
+        # Run in the caller's context so the push span keeps its parent
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, push_mirror, repo_dir, org_login, repo, github_token)
+
+    def push_many(self, repo_dir, repo, org_logins, github_token):
+        """Push one local repo to many orgs, returning results in org order"""
+        futures = [self.submit(repo_dir, org_login, repo, github_token) for org_login in org_logins]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+
+# --- Config ---
+MAX_RETRIES = int(os.environ.get("GITHUB_MAX_RETRIES", "5"))
+BURST = int(os.environ.get("GITHUB_RATE_BURST", "50"))
+# GitHub's secondary limit on content-creating requests is 80 per minute
+WRITES_PER_MINUTE = int(os.environ.get("GITHUB_WRITES_PER_MINUTE", "80"))
+# Hourly budgets assumed until the first response tells us the real ones
+DEFAULT_LIMITS = {"core": 5000, "graphql": 5000, "search": 30 * 60}
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+
+def resource_for(path):
+    """Map an API path or URL to the rate-limit resource GitHub bills it against"""
+    if "://" in path:
+        path = urlsplit(path).path
+    path = "/" + path.lstrip("/")
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+class TokenBucket:
+    """Classic token bucket; rate is tokens per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait for it"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0 or self.rate <= 0:
+            # An exhausted budget is handled by the reset time instead
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Paces GitHub calls against the REST, search and GraphQL budgets
+
+    Each resource has its own token bucket whose refill rate is re-derived
+    from X-RateLimit-Remaining / X-RateLimit-Reset after every response, so
+    the remaining budget is spread evenly until the window resets. Writes
+    also go through a bucket sized to GitHub's secondary write limit.
+    """
+
+    def __init__(self, burst=BURST, writes_per_minute=WRITES_PER_MINUTE):
+        self._lock = threading.Lock()
+        self._buckets = {
+            resource: TokenBucket(limit / 3600.0, burst)
+            for resource, limit in DEFAULT_LIMITS.items()
+        }
+        self._writes = TokenBucket(writes_per_minute / 60.0, max(1, writes_per_minute // 4))
+        self._budget = {
+            resource: {"limit": limit, "remaining": limit, "reset": None}
+            for resource, limit in DEFAULT_LIMITS.items()
+        }
+        # Until a resource's budget resets once it is used up
+        self._blocked_until = {}
+        # Secondary-limit backoff, which holds back every resource
+        self._all_blocked_until = 0.0
+
+    def reserve(self, resource, write=False):
+        """Claim a slot for a call and return how long to wait before sending it"""
+        with self._lock:
+            blocked_until = max(self._all_blocked_until, self._blocked_until.get(resource, 0.0))
+            wait = max(0.0, blocked_until - time.time())
+            bucket = self._buckets.setdefault(resource, TokenBucket(1.0, BURST))
+            wait = max(wait, bucket.reserve())
+            if write:
+                wait = max(wait, self._writes.reserve())
+        return wait
+
+    def acquire(self, resource, write=False):
+        """Block until a call against resource may be sent"""
+        wait = self.reserve(resource, write)
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, resource, response):
+        """Refresh a budget from a response's rate-limit headers"""
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        remaining = int(remaining)
+        reset = int(reset)
+        with self._lock:
+            budget = self._budget.setdefault(resource, {"limit": None, "remaining": None, "reset": None})
+            budget["remaining"] = remaining
+            budget["reset"] = reset
+            if headers.get("X-RateLimit-Limit"):
+                budget["limit"] = int(headers["X-RateLimit-Limit"])
+
+            bucket = self._buckets.setdefault(resource, TokenBucket(1.0, BURST))
+            window = max(1.0, reset - time.time())
+            bucket.rate = remaining / window
+            bucket.tokens = min(bucket.tokens, remaining)
+            if remaining == 0:
+                self._blocked_until[resource] = max(self._blocked_until.get(resource, 0.0), float(reset))
+
+    def is_rate_limited(self, response):
+        """True for primary and secondary rate-limit rejections"""
+        if response.status_code not in (403, 429):
+            return False
+        if response.status_code == 429 or "Retry-After" in response.headers:
+            return True
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            return True
+        return "rate limit" in response.text.lower()
+
+    def backoff_delay(self, response, attempt):
+        """How long to wait before retrying a rate-limited call, with jitter
+
+        An exhausted primary budget only holds back its own resource (update()
+        already blocked it until the reset); a secondary limit holds back
+        every caller for the same period.
+        """
+        retry_after = response.headers.get("Retry-After")
+        primary = False
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        elif response.headers.get("X-RateLimit-Remaining") == "0" and response.headers.get("X-RateLimit-Reset"):
+            delay = max(0.0, int(response.headers["X-RateLimit-Reset"]) - time.time())
+            primary = True
+        else:
+            delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+        delay = delay * random.uniform(1.0, 1.25) + random.uniform(0, 1.0)
+        print(f"[!] GitHub rate limit hit ({response.status_code}), retrying in {delay:.1f}s", file=sys.stderr)
+        if not primary:
+            with self._lock:
+                self._all_blocked_until = max(self._all_blocked_until, time.time() + delay)
+        return delay
+
+    def backoff(self, response, attempt):
+        """Sleep before retrying a rate-limited call"""
+        time.sleep(self.backoff_delay(response, attempt))
+
+    def budget(self):
+        """Current remaining budget per resource, for metrics and logging"""
+        with self._lock:
+            return {resource: dict(budget) for resource, budget in self._budget.items()}
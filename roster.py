@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import re
+import sys
+import csv
+import json
+
+# --- Helper Functions ---
+def split_repos(value):
+    """Accept a list or a ';'/','-separated string of repo names"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = re.split(r"[;,]", value)
+    repos = [repo.strip() for repo in value if repo and repo.strip()]
+    return repos or None
+
+def detect_format(path):
+    if path.lower().endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return "csv"
+
+def _csv_rows(f):
+    for row in csv.DictReader(f):
+        yield {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+
+def _jsonl_rows(f):
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"[!] Roster line {line_number}: invalid JSON ({e}), skipping", file=sys.stderr)
+            continue
+        if isinstance(row, str):
+            row = {"email": row}
+        if isinstance(row, dict):
+            # Keys matched case-insensitively, as CSV headers are
+            yield {str(key).strip().lower(): value for key, value in row.items()}
+
+def read_roster(path, fmt=None, validate=None):
+    """Stream participant rows from a CSV or JSONL roster ('-' reads stdin)
+
+    Each row is a dict with "email" and, when the roster provides them,
+    "org_login" and "repos_to_clone" (a list, read from a "repos" column or
+    key). Rows are read one at a time so arbitrarily large rosters use
+    constant memory; rows without an email or failing validate(email) are
+    reported on stderr and skipped.
+    """
+    fmt = fmt or ("csv" if path == "-" else detect_format(path))
+    f = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        rows = _jsonl_rows(f) if fmt == "jsonl" else _csv_rows(f)
+        for row in rows:
+            email = (row.get("email") or "").strip()
+            if not email:
+                print(f"[!] Skipping roster row without an email: {json.dumps(row)}", file=sys.stderr)
+                continue
+            if validate and not validate(email):
+                print(f"[!] Skipping invalid email in roster: {email}", file=sys.stderr)
+                continue
+
+            participant = {"email": email}
+            org_login = (row.get("org_login") or row.get("org") or "").strip()
+            if org_login:
+                participant["org_login"] = org_login
+            repos = split_repos(row.get("repos"))
+            if repos:
+                participant["repos_to_clone"] = repos
+            yield participant
+    finally:
+        if f is not sys.stdin:
+            f.close()
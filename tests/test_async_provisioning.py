@@ -0,0 +1,77 @@
+import os
+import sys
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import async_provisioning
+from async_provisioning import AsyncGitHubClient, TemplateRepos
+from fake_github import FakeGitHub
+from mirror_cache import set_git_base
+
+SOURCE_ORG = "template-org"
+REPOS = ["Java-Repo01", "Java-Repo02"]
+EMAIL = "ada.lovelace@example.com"
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGitHub().start()
+    for repo in REPOS:
+        fake.seed(SOURCE_ORG, repo)
+    set_git_base(fake.base_url)
+    yield fake
+    fake.stop()
+
+
+def provision(fake, tmp_path, client_setup, logins=None):
+    async def run():
+        client = AsyncGitHubClient("test-token", api_base=fake.base_url)
+        client_setup(client)
+        try:
+            return await async_provisioning.provision_participant_async(
+                EMAIL, client, "test-enterprise", SOURCE_ORG, REPOS, "test-token",
+                TemplateRepos(SOURCE_ORG, "test-token", str(tmp_path)), asyncio.Semaphore(2), logins=logins
+            )
+        finally:
+            await client.aclose()
+    return asyncio.run(run())
+
+
+def test_repo_create_error_keeps_organization(fake, tmp_path):
+    def failing_repo_post(client):
+        post = client.post
+
+        async def patched(path, **kwargs):
+            if path.endswith("/repos"):
+                raise RuntimeError("read timed out")
+            return await post(path, **kwargs)
+        client.post = patched
+
+    result = provision(fake, tmp_path, failing_repo_post, logins={EMAIL: "ada"})
+    assert result["success"]
+    assert result["organization"] in fake.orgs
+    assert "repos_seconds" in result["timings"]
+    assert result["repo_results"] == [f"Error cloning repository '{repo}': read timed out" for repo in REPOS]
+
+
+def test_missing_batch_login_falls_back_to_single_search(fake, tmp_path):
+    queries = []
+
+    def record_queries(client):
+        graphql = client.graphql
+
+        async def patched(query, variables=None):
+            queries.append(query)
+            return await graphql(query, variables)
+        client.graphql = patched
+
+    # The batched search for this email failed, so it is not in logins
+    result = provision(fake, tmp_path, record_queries, logins={})
+    assert result["success"]
+    assert fake.snapshot()["graphql.search"] == 1
+    mutation = next(query for query in queries if "createEnterpriseOrganization" in query)
+    assert 'adminLogins: ["ada-lovelace"]' in mutation
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import workshop_orchestrator
+from fake_github import FakeGitHub
+from github_client import set_api_base
+from journal import ProvisioningJournal, DONE, FAILED
+from mirror_cache import set_git_base
+
+SOURCE_ORG = "template-org"
+REPO = "Java-Repo01"
+ORG = "participant-org"
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGitHub().start()
+    fake.seed(SOURCE_ORG, REPO)
+    fake.orgs.add(ORG)
+    set_api_base(fake.base_url)
+    set_git_base(fake.base_url)
+    yield fake
+    fake.stop()
+
+
+def test_resume_retries_failed_push(fake, tmp_path, monkeypatch):
+    journal = ProvisioningJournal(str(tmp_path / "journal.jsonl"))
+    participant = journal.for_participant("ada@example.com")
+
+    def failing_push(repo_dir, org_login, repo, github_token):
+        return {"returncode": 1, "repo": repo, "org_login": org_login, "duration": 0.0, "stderr": "boom"}
+
+    # First run: the repo is created but the push fails
+    monkeypatch.setattr(workshop_orchestrator, "push_mirror", failing_push)
+    workshop_orchestrator.clone_repositories(ORG, [REPO], SOURCE_ORG, "test-token", journal=participant)
+    assert participant.get(f"repo:{REPO}")["status"] == FAILED
+    assert fake.snapshot().get("git.git-receive-pack", 0) == 0
+
+    # Resume: creation answers 422, the push must still be retried
+    monkeypatch.undo()
+    results = workshop_orchestrator.clone_repositories(ORG, [REPO], SOURCE_ORG, "test-token", journal=participant)
+    entry = participant.get(f"repo:{REPO}")
+    assert entry["status"] == DONE
+    assert not entry.get("skipped")
+    assert fake.snapshot()["git.git-receive-pack"] == 1
+    assert results[0].startswith("Successfully cloned")
+    journal.close()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+import threading
+from contextlib import contextmanager
+from github_client import get_client, describe_token
+
+# A token whose last few calls all failed with 5xx is only used when no
+# other token is available
+UNHEALTHY_ERRORS = 3
+
+
+class TokenPool:
+    """Spreads provisioning work across several GitHub tokens
+
+    Each token keeps its own pooled client and rate limiter (shared with
+    get_client). lease() hands out the healthy token with the most budget
+    left for a resource, divided among the work already leased on it, so
+    concurrent participants land on different tokens. Tokens that get a
+    401 are dropped for the rest of the run.
+    """
+
+    def __init__(self, tokens, **client_kwargs):
+        self.tokens = list(dict.fromkeys(token for token in tokens if token))
+        if not self.tokens:
+            raise ValueError("TokenPool needs at least one token")
+        self._clients = {token: get_client(token, **client_kwargs) for token in self.tokens}
+        self._leases = dict.fromkeys(self.tokens, 0)
+        self._assigned = dict.fromkeys(self.tokens, 0)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def client(self, token):
+        return self._clients[token]
+
+    def is_healthy(self, token):
+        return not self._clients[token].unauthorized
+
+    def healthy_tokens(self):
+        return [token for token in self.tokens if self.is_healthy(token)]
+
+    def _remaining(self, token, resource):
+        budget = self._clients[token].rate_limit_budget().get(resource, {})
+        remaining = budget.get("remaining")
+        return (budget.get("limit") or 0) if remaining is None else remaining
+
+    def _choose(self, resource):
+        candidates = self.healthy_tokens()
+        if not candidates:
+            raise RuntimeError("No usable GitHub tokens left in the pool")
+
+        def rank(token):
+            failing = self._clients[token].consecutive_errors >= UNHEALTHY_ERRORS
+            share = self._remaining(token, resource) / (self._leases[token] + 1)
+            return (failing, -share, self._assigned[token])
+
+        return min(candidates, key=rank)
+
+    @contextmanager
+    def lease(self, resource="core"):
+        """Yield the best token for resource and count it as busy meanwhile"""
+        with self._lock:
+            token = self._choose(resource)
+            self._leases[token] += 1
+            self._assigned[token] += 1
+        try:
+            yield token
+        finally:
+            with self._lock:
+                self._leases[token] -= 1
+
+    def pick(self, resource="core"):
+        """Best token for a one-off call, without leasing it"""
+        with self._lock:
+            return self._choose(resource)
+
+    def status(self):
+        """Per-token health and budget, with tokens masked, for logging"""
+        report = []
+        for token in self.tokens:
+            client = self._clients[token]
+            report.append({
+                "token": describe_token(token),
+                "healthy": not client.unauthorized,
+                "consecutive_errors": client.consecutive_errors,
+                "remaining": {
+                    resource: budget.get("remaining")
+                    for resource, budget in client.rate_limit_budget().items()
+                }
+            })
+        return report
+
+
+def read_tokens(value=None, path=None):
+    """Tokens from a comma-separated string and/or a file with one per line"""
+    tokens = [token.strip() for token in (value or "").split(",")]
+    if path:
+        with open(path, encoding="utf-8") as f:
+            tokens.extend(line.strip() for line in f if not line.lstrip().startswith("#"))
+    return [token for token in tokens if token]
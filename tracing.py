@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Lightweight spans for GitHub calls and git subprocesses.
+
+Set WORKSHOP_TRACE to a file path to record a span for every API request
+and git command; the trace is written when the process exits. The format
+is picked with WORKSHOP_TRACE_FORMAT: "chrome" (default; open it in
+chrome://tracing or https://ui.perfetto.dev) or "otel" (OTLP/JSON, as
+accepted by an OpenTelemetry collector's file receiver). With tracing off,
+span() hands back a shared no-op object.
+"""
+import os
+import json
+import time
+import atexit
+import asyncio
+import secrets
+import threading
+import contextvars
+
+# --- Config ---
+TRACE_PATH = os.environ.get("WORKSHOP_TRACE")
+TRACE_FORMAT = os.environ.get("WORKSHOP_TRACE_FORMAT", "chrome")
+SERVICE_NAME = "workshop-orchestrator"
+
+
+class _NoopSpan:
+    recording = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+# The open span of the current thread or asyncio task, parent of new spans
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def _lane():
+    """Trace viewer row: the asyncio task if one is running, else the thread"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+class Span:
+    recording = True
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = None
+        self.thread_id = _lane()
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error = None
+        self._context_token = None
+
+    def __enter__(self):
+        parent = _current_span.get()
+        if parent is not None:
+            self.parent_id = parent.span_id
+        self._context_token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._context_token)
+        self.tracer.finish(self)
+        return False
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    """Collects finished spans in memory and writes them out in one go"""
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def finish(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        events = []
+        for span in self.snapshot():
+            args = dict(span.attributes)
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "name": span.name,
+                "cat": span.name.split(" ", 1)[0].split(".", 1)[0],
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def otel_trace(self):
+        spans = []
+        for span in self.snapshot():
+            otel_span = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 3 if span.name.startswith(("github.", "git ")) else 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [_otel_attribute(key, value) for key, value in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+            }
+            if span.parent_id:
+                otel_span["parentSpanId"] = span.parent_id
+            spans.append(otel_span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otel_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": "tracing"}, "spans": spans}],
+            }]
+        }
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.spans)
+
+    def export(self, path, fmt=TRACE_FORMAT):
+        document = self.otel_trace() if fmt == "otel" else self.chrome_trace()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+
+
+def _otel_attribute(key, value):
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+# --- Module-level tracer ---
+_tracer = None
+
+def enable(path, fmt=TRACE_FORMAT):
+    """Start recording spans; they are written to path when the process exits"""
+    global _tracer
+    _tracer = Tracer()
+    atexit.register(_tracer.export, path, fmt)
+    return _tracer
+
+def enabled():
+    return _tracer is not None
+
+def span(name, **attributes):
+    """Context manager timing one operation; a no-op unless tracing is on"""
+    if _tracer is None:
+        return NOOP_SPAN
+    return Span(_tracer, name, attributes)
+
+if TRACE_PATH:
+    enable(TRACE_PATH)
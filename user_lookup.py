@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import sys
+import json
+
+# --- Config ---
+# Every aliased search field is billed separately against the GraphQL
+# budget and GitHub rejects documents that ask for too many at once, so
+# large rosters are split into chunks of this size.
+SEARCH_BATCH_SIZE = 25
+
+# --- Helper Functions ---
+def build_search_query(emails):
+    """Build one GraphQL document with an aliased user search per email"""
+    fields = []
+    for i, email in enumerate(emails):
+        search_query = json.dumps(f"{email} in:email")
+        fields.append(f"""
+      u{i}: search(query: {search_query}, type: USER, first: 1) {{
+        userCount
+        edges {{
+          node {{
+            ... on User {{
+              login
+            }}
+          }}
+        }}
+      }}""")
+    return "query {" + "".join(fields) + "\n    }"
+
+def parse_search_result(search):
+    """Return the login from one search field, or None when nobody matched"""
+    if search.get("userCount", 0) > 0 and search.get("edges"):
+        return search["edges"][0]["node"].get("login")
+    return None
+
+def resolve_logins(emails, client, batch_size=SEARCH_BATCH_SIZE, cache=None):
+    """Resolve participant emails to GitHub logins in batched GraphQL searches
+
+    Returns an email -> login map. Emails with no matching user map to None;
+    emails whose search failed are left out so callers can fall back to a
+    single lookup. When a LoginCache is given, cached emails are answered
+    from it and fresh results are written back.
+    """
+    logins = {}
+    unique_emails = []
+    for email in dict.fromkeys(emails):
+        if cache is not None:
+            hit, login = cache.lookup(email)
+            if hit:
+                logins[email] = login
+                continue
+        unique_emails.append(email)
+
+    resolved = {}
+    for start in range(0, len(unique_emails), batch_size):
+        chunk = unique_emails[start:start + batch_size]
+        try:
+            result = client.graphql(build_search_query(chunk))
+        except Exception as e:
+            print(f"[!] Batch user lookup failed for {len(chunk)} emails: {e}", file=sys.stderr)
+            continue
+
+        data = result.get("data") or {}
+        for i, email in enumerate(chunk):
+            search = data.get(f"u{i}")
+            if search is not None:
+                resolved[email] = parse_search_result(search)
+
+    if cache is not None and resolved:
+        cache.store_many(resolved)
+    logins.update(resolved)
+    return logins